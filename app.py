@@ -1,50 +1,180 @@
 #!/usr/bin/env python3
 """Brand Kit Generator - Web UI with FastAPI + Datastar."""
 import asyncio
+import dataclasses
 import hashlib
 import io
+import json
+import os
+import re
+import tempfile
+import threading
 import zipfile
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Dict, Hashable, Iterator, Optional, Union
 
-from fastapi import FastAPI, Query, Request
-from fastapi.responses import HTMLResponse, StreamingResponse, JSONResponse
+from fastapi import Depends, FastAPI, Request
+from fastapi.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
 from extractors.color_extractor import ColorExtractor
 from extractors.brand_extractor import BrandExtractor
+from generators.browser_pool import close_pool_browsers
 from generators.html_generator import HTMLGenerator
-from generators.favicon_builder import build_favicon_set
-from models.brand_identity import BrandIdentity, StyleConfig, BG_EFFECTS
+from generators.favicon_builder import encode_favicon_set
+from models.brand_identity import BrandIdentity, StyleConfig, BG_EFFECTS, BgEffect
+from utils.disk_cache import DiskCache
 
 app = FastAPI(title="Brand Kit Generator")
 
-# Simple LRU cache for generated images (max 50 items)
-_image_cache: OrderedDict[str, bytes] = OrderedDict()
-_CACHE_MAX_SIZE = 50
+
+class _LRUCache:
+    """Thread-safe LRU cache bounded by the total size of its values.
+
+    A byte budget (rather than an item count) keeps memory bounded no
+    matter whether entries are tiny logos or large OG images.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._items: OrderedDict[str, Union[bytes, str]] = OrderedDict()
+        self._bytes = 0
+        # Touched from the event loop and from worker threads
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Union[bytes, str]]:
+        """Get item from cache, move to end (LRU)."""
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                return self._items[key]
+        return None
+
+    def set(self, key: str, value: Union[bytes, str]):
+        """Set item in cache, evict oldest until under budget."""
+        size = len(value)
+        # Don't let a single huge entry flush everything else
+        if size > self.max_bytes // 4:
+            return
+        with self._lock:
+            previous = self._items.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous)
+            self._items[key] = value
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self._bytes -= len(evicted)
+
+
+# Runs of anything but lowercase alphanumerics become one dash in filenames
+_UNSAFE_FILENAME_RE = re.compile(r"[^a-z0-9]+")
+
+# Previews are a pure function of their query string, so browsers may reuse them
+_PREVIEW_CACHE_CONTROL = "public, max-age=3600"
+
+# LRU caches for generated images and preview HTML
+_image_cache = _LRUCache(max_bytes=64 * 1024 * 1024)
+_html_cache = _LRUCache(max_bytes=4 * 1024 * 1024)
+
+# Rendered PNGs also go to disk (set BRAND_KIT_CACHE_DIR to share a volume)
+_disk_cache = DiskCache(
+    os.environ.get("BRAND_KIT_CACHE_DIR") or Path(tempfile.gettempdir()) / "brand-kit-cache",
+    max_bytes=1024 * 1024 * 1024,
+)
+
+
+def _get_cached_image(key: str) -> Optional[bytes]:
+    """Look up encoded image bytes in memory, then on disk (blocking; see _lookup_image)."""
+    data = _image_cache.get(key)
+    if data is None:
+        data = _disk_cache.get(key)
+        if data is not None:
+            _image_cache.set(key, data)
+    return data
+
+
+def _set_cached_image(key: str, data: bytes):
+    """Store encoded image bytes in memory and on disk (blocking)."""
+    _image_cache.set(key, data)
+    _disk_cache.set(key, data)
+
+
+async def _lookup_image(key: str) -> Optional[bytes]:
+    """_get_cached_image for the event loop; only a memory miss goes to a thread."""
+    data = _image_cache.get(key)
+    if data is None:
+        data = await asyncio.to_thread(_get_cached_image, key)
+    return data
+
+
+def _render_and_cache(key: str, func: Callable, *args) -> bytes:
+    """Run a render job and cache its result, all on the worker thread."""
+    data = func(*args)
+    _set_cached_image(key, data)
+    return data
 
 
 def _cache_key(*args) -> str:
-    """Generate cache key from arguments."""
-    return hashlib.md5(str(args).encode()).hexdigest()
+    """Generate cache key from arguments.
+
+    Feeds each argument into blake2b separately (no repr of the whole
+    tuple); the separator byte keeps ("ab", "c") and ("a", "bc") apart.
+    Dataclasses contribute all their field values, not their repr
+    (BrandIdentity's repr leaves fields out).
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for arg in args:
+        if dataclasses.is_dataclass(arg):
+            arg = dataclasses.astuple(arg)
+        h.update(arg.encode() if isinstance(arg, str) else str(arg).encode())
+        h.update(b"\x1f")
+    return h.hexdigest()
 
 
-def _get_cached(key: str) -> Optional[bytes]:
-    """Get item from cache, move to end (LRU)."""
-    if key in _image_cache:
-        _image_cache.move_to_end(key)
-        return _image_cache[key]
-    return None
+# Dedicated render workers. Each thread keeps its own Chromium (see
+# generators.browser_pool), so the pool size also caps running browsers.
+_RENDER_WORKERS = min(4, os.cpu_count() or 1)
+_RENDER_POOL = ThreadPoolExecutor(
+    max_workers=_RENDER_WORKERS,
+    thread_name_prefix="render",
+)
 
+# Renders currently running, so identical concurrent requests share one
+_inflight: dict[Hashable, asyncio.Task] = {}
+
+
+async def _run_coalesced(key: Hashable, func: Callable, *args):
+    """Run func(*args) on the render pool, once per key at a time.
+
+    Concurrent callers with the same key await the same task instead of
+    repeating the Playwright work. The task is shielded so one client
+    disconnecting doesn't cancel it for the others.
+    """
+    task = _inflight.get(key)
+    if task is None:
+        loop = asyncio.get_running_loop()
+        task = asyncio.ensure_future(loop.run_in_executor(_RENDER_POOL, func, *args))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    return await asyncio.shield(task)
+
+
+# Stateless apart from settings (HTTP goes through utils.http.SESSION); build once
+_COLOR_EXTRACTOR = ColorExtractor()
+_BRAND_EXTRACTOR = BrandExtractor()
+
+
+@lru_cache(maxsize=128)
+def _html_generator(brand: BrandIdentity, style: StyleConfig) -> HTMLGenerator:
+    """Get a (cached) HTMLGenerator for brand + style."""
+    return HTMLGenerator(brand, style=style)
 
-def _set_cached(key: str, value: bytes):
-    """Set item in cache, evict oldest if full."""
-    _image_cache[key] = value
-    _image_cache.move_to_end(key)
-    while len(_image_cache) > _CACHE_MAX_SIZE:
-        _image_cache.popitem(last=False)
 
 # Setup templates
 BASE_DIR = Path(__file__).parent
@@ -54,6 +184,13 @@ templates = Jinja2Templates(directory=BASE_DIR / "templates")
 app.mount("/static", StaticFiles(directory=BASE_DIR / "output"), name="static")
 
 
+@app.on_event("shutdown")
+def _shutdown_render_pool():
+    """Let in-flight renders finish, then close each worker's Chromium."""
+    close_pool_browsers(_RENDER_POOL, _RENDER_WORKERS)
+    _RENDER_POOL.shutdown(wait=True)
+
+
 @app.get("/", response_class=HTMLResponse)
 async def index(request: Request):
     """Serve main page."""
@@ -65,12 +202,10 @@ async def extract_brand(url: str):
     """Extract brand identity from URL."""
     try:
         # Extract colors
-        color_extractor = ColorExtractor()
-        color_data = color_extractor.extract_from_url(url)
+        color_data = _COLOR_EXTRACTOR.extract_from_url(url)
 
         # Extract brand info
-        brand_extractor = BrandExtractor()
-        brand_data = brand_extractor.extract_from_url(url)
+        brand_data = _BRAND_EXTRACTOR.extract_from_url(url)
 
         return {
             "success": True,
@@ -102,7 +237,7 @@ def create_brand_identity(
     return BrandIdentity(
         name=name,
         domain="",
-        colors=[],
+        colors=(),
         primary_color=primary,
         accent_color=accent,
         background_color=background,
@@ -112,15 +247,6 @@ def create_brand_identity(
     )
 
 
-def parse_bool(val) -> bool:
-    """Parse boolean from string or bool."""
-    if isinstance(val, bool):
-        return val
-    if isinstance(val, str):
-        return val.lower() in ('true', '1', 'yes')
-    return bool(val)
-
-
 def create_style_config(
     glow: float = 1.0,
     depth: float = 1.0,
@@ -128,11 +254,11 @@ def create_style_config(
     gradient_angle: int = 160,
     font: str = "Inter",
     font_weight: int = 800,
-    show_accent_line = True,
-    show_bottom_bar = True,
-    show_blobs = True,
-    show_glow = True,
-    bg_effect: str = "aurora",
+    show_accent_line: bool = True,
+    show_bottom_bar: bool = True,
+    show_blobs: bool = True,
+    show_glow: bool = True,
+    bg_effect: BgEffect = "aurora",
 ) -> StyleConfig:
     """Create StyleConfig from parameters."""
     return StyleConfig(
@@ -142,14 +268,93 @@ def create_style_config(
         gradient_angle=gradient_angle,
         font=font,
         font_weight=font_weight,
-        show_accent_line=parse_bool(show_accent_line),
-        show_bottom_bar=parse_bool(show_bottom_bar),
-        show_blobs=parse_bool(show_blobs),
-        show_glow=parse_bool(show_glow),
+        show_accent_line=show_accent_line,
+        show_bottom_bar=show_bottom_bar,
+        show_blobs=show_blobs,
+        show_glow=show_glow,
         bg_effect=bg_effect,
     )
 
 
+@dataclass(frozen=True)
+class LogoParams:
+    """Query parameters for the logo previews.
+
+    Injected with Depends() so the endpoints share one signature; frozen
+    so a whole instance can go into _cache_key.
+    """
+    name: str
+    primary: str = "#333333"
+    accent: str = "#666666"
+    background: str = "#ffffff"
+    glow: float = 1.0
+    depth: float = 1.0
+    font: str = "Inter"
+    fontWeight: int = 800
+    showGlow: bool = True
+
+    def brand(self) -> BrandIdentity:
+        """Create BrandIdentity from the query."""
+        return create_brand_identity(
+            name=self.name,
+            primary=self.primary,
+            accent=self.accent,
+            background=self.background,
+        )
+
+    def style(self) -> StyleConfig:
+        """Create StyleConfig from the query."""
+        return create_style_config(
+            glow=self.glow,
+            depth=self.depth,
+            font=self.font,
+            font_weight=self.fontWeight,
+            show_glow=self.showGlow,
+        )
+
+
+@dataclass(frozen=True)
+class OGParams(LogoParams):
+    """Query parameters for the OG previews and the kit download."""
+    tagline: str = ""
+    text: str = "#ffffff"
+    theme: str = "light"
+    decoration: float = 1.0
+    gradientAngle: int = 160
+    showAccentLine: bool = True
+    showBottomBar: bool = True
+    showBlobs: bool = True
+    bgEffect: BgEffect = "aurora"
+
+    def brand(self) -> BrandIdentity:
+        """Create BrandIdentity from the query."""
+        return create_brand_identity(
+            name=self.name,
+            tagline=self.tagline,
+            primary=self.primary,
+            accent=self.accent,
+            background=self.background,
+            text=self.text,
+            theme=self.theme,
+        )
+
+    def style(self) -> StyleConfig:
+        """Create StyleConfig from the query."""
+        return create_style_config(
+            glow=self.glow,
+            depth=self.depth,
+            decoration=self.decoration,
+            gradient_angle=self.gradientAngle,
+            font=self.font,
+            font_weight=self.fontWeight,
+            show_accent_line=self.showAccentLine,
+            show_bottom_bar=self.showBottomBar,
+            show_blobs=self.showBlobs,
+            show_glow=self.showGlow,
+            bg_effect=self.bgEffect,
+        )
+
+
 @app.get("/effects")
 async def get_effects():
     """Return available background effects."""
@@ -157,282 +362,171 @@ async def get_effects():
 
 
 @app.get("/preview/logo.html", response_class=HTMLResponse)
-async def preview_logo_html(
-    name: str = Query(...),
-    primary: str = Query("#333333"),
-    accent: str = Query("#666666"),
-    background: str = Query("#ffffff"),
-    glow: float = Query(1.0),
-    depth: float = Query(1.0),
-    font: str = Query("Inter"),
-    fontWeight: int = Query(800),
-    showGlow: str = Query("true"),
-):
+async def preview_logo_html(params: LogoParams = Depends()):
     """Return raw HTML for logo preview (instant, no Playwright)."""
-    brand = create_brand_identity(
-        name=name,
-        primary=primary,
-        accent=accent,
-        background=background,
-    )
-    style = create_style_config(
-        glow=glow,
-        depth=depth,
-        font=font,
-        font_weight=fontWeight,
-        show_glow=showGlow,
-    )
-    generator = HTMLGenerator(brand, style=style)
-    html = generator.get_logo_html(size=512)
-
-    # Scale to viewport for iframe
-    scaled_html = html.replace(
-        'width: 512px;\n            height: 512px;',
-        'width: 100vw;\n            height: 100vh;'
-    ).replace(
-        'width: 492px;\n            height: 492px;',
-        'width: 96vw;\n            height: 96vh;'
-    ).replace(
-        'border-radius: 102px;',
-        'border-radius: 20%;'
-    ).replace(
-        'font-size: 215px;',
-        'font-size: 42vw;'
-    ).replace(
-        'letter-spacing: -4px;',
-        'letter-spacing: -0.8vw;'
-    )
-    return scaled_html
+    cache_key = _cache_key("logo.html", params)
+    cached = _html_cache.get(cache_key)
+    if cached:
+        return cached
+
+    brand = params.brand()
+    style = params.style()
+    generator = _html_generator(brand, style)
+    # Scaled to the viewport so it fills the iframe
+    html = generator.get_logo_html(size=512, responsive=True)
+    _html_cache.set(cache_key, html)
+    return html
 
 
 @app.get("/preview/og.html", response_class=HTMLResponse)
-async def preview_og_html(
-    name: str = Query(...),
-    tagline: str = Query(""),
-    primary: str = Query("#333333"),
-    accent: str = Query("#666666"),
-    background: str = Query("#ffffff"),
-    text: str = Query("#ffffff"),
-    theme: str = Query("light"),
-    glow: float = Query(1.0),
-    depth: float = Query(1.0),
-    decoration: float = Query(1.0),
-    gradientAngle: int = Query(160),
-    font: str = Query("Inter"),
-    fontWeight: int = Query(800),
-    showAccentLine: str = Query("true"),
-    showBottomBar: str = Query("true"),
-    showBlobs: str = Query("true"),
-    showGlow: str = Query("true"),
-    bgEffect: str = Query("aurora"),
-):
+async def preview_og_html(params: OGParams = Depends()):
     """Return raw HTML for OG image preview (instant, no Playwright).
 
     Uses 100vw/100vh to fill iframe while maintaining design proportions.
     """
-    brand = create_brand_identity(
-        name=name,
-        tagline=tagline,
-        primary=primary,
-        accent=accent,
-        background=background,
-        text=text,
-        theme=theme,
-    )
-    style = create_style_config(
-        glow=glow,
-        depth=depth,
-        decoration=decoration,
-        gradient_angle=gradientAngle,
-        font=font,
-        font_weight=fontWeight,
-        show_accent_line=showAccentLine,
-        show_bottom_bar=showBottomBar,
-        show_blobs=showBlobs,
-        show_glow=showGlow,
-        bg_effect=bgEffect,
+    cache_key = _cache_key("og.html", params)
+    cached = _html_cache.get(cache_key)
+    if cached:
+        return cached
+
+    brand = params.brand()
+    style = params.style()
+    generator = _html_generator(brand, style)
+    # Scaled to the viewport so it fills the iframe
+    html = generator.get_og_html(width=1200, height=630, responsive=True)
+    _html_cache.set(cache_key, html)
+    return html
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Check whether the client already holds the response tagged etag."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    return if_none_match.strip() == "*" or etag in (t.strip() for t in if_none_match.split(","))
+
+
+def _image_response(image_bytes: bytes, etag: str, media_type: str = "image/png") -> Response:
+    """Wrap image bytes in a single-shot, browser-cacheable response."""
+    return Response(
+        content=image_bytes,
+        media_type=media_type,
+        headers={"Cache-Control": _PREVIEW_CACHE_CONTROL, "ETag": etag},
     )
-    generator = HTMLGenerator(brand, style=style)
-    # Get full-size HTML and wrap with scaling
-    html = generator.get_og_html(width=1200, height=630)
-
-    # Wrap to scale to iframe viewport
-    scaled_html = html.replace(
-        'width: 1200px;\n            height: 630px;',
-        'width: 100vw;\n            height: 100vh;'
-    ).replace(
-        'font-size: 88px;',
-        'font-size: 7.3vw;'  # 88/1200 ≈ 7.3%
-    ).replace(
-        'font-size: 26px;',
-        'font-size: 2.2vw;'  # 26/1200 ≈ 2.2%
-    ).replace(
-        'font-size: 24px;',
-        'font-size: 2vw;'
-    ).replace(
-        'font-size: 22px;',
-        'font-size: 1.8vw;'
-    ).replace(
-        'font-size: 20px;',
-        'font-size: 1.7vw;'
+
+
+def _not_modified(etag: str) -> Response:
+    """Empty 304 for a client that already has this preview."""
+    return Response(
+        status_code=304,
+        headers={"Cache-Control": _PREVIEW_CACHE_CONTROL, "ETag": etag},
     )
-    return scaled_html
 
 
-def _generate_logo_sync(brand: BrandIdentity, style: StyleConfig) -> bytes:
-    """Generate logo in sync context (for thread pool)."""
-    generator = HTMLGenerator(brand, style=style)
-    img = generator.generate_logo(size=512)
+def _encode_png(img) -> bytes:
+    """Encode a PIL image as PNG bytes."""
     buffer = io.BytesIO()
     img.save(buffer, format="PNG")
     return buffer.getvalue()
 
 
+def _generate_logo_sync(brand: BrandIdentity, style: StyleConfig) -> bytes:
+    """Generate logo in sync context (for thread pool)."""
+    generator = _html_generator(brand, style)
+    return _encode_png(generator.generate_logo(size=512))
+
+
 @app.get("/preview/logo")
 async def preview_logo(
-    name: str = Query(...),
-    primary: str = Query("#333333"),
-    accent: str = Query("#666666"),
-    background: str = Query("#ffffff"),
-    glow: float = Query(1.0),
-    depth: float = Query(1.0),
-    font: str = Query("Inter"),
-    fontWeight: int = Query(800),
-    showGlow: str = Query("true"),
+    request: Request,
+    params: LogoParams = Depends(),
 ):
     """Generate logo preview PNG (with caching)."""
-    cache_key = _cache_key("logo", name, primary, accent, background, glow, depth, font, fontWeight, showGlow)
+    brand = params.brand()
+    style = params.style()
+
+    # Keyed on the parsed objects so /download can share rendered images
+    cache_key = _cache_key("logo", brand, style)
+
+    # The cache key fully determines the image, so it doubles as the ETag
+    etag = f'"{cache_key}"'
+    if _etag_matches(request, etag):
+        return _not_modified(etag)
 
     # Check cache first
-    cached = _get_cached(cache_key)
+    cached = await _lookup_image(cache_key)
     if cached:
-        return StreamingResponse(io.BytesIO(cached), media_type="image/png")
+        return _image_response(cached, etag)
 
-    brand = create_brand_identity(
-        name=name,
-        primary=primary,
-        accent=accent,
-        background=background,
-    )
-    style = create_style_config(
-        glow=glow,
-        depth=depth,
-        font=font,
-        font_weight=fontWeight,
-        show_glow=showGlow,
+    # Run Playwright on the render pool (sync API doesn't work in async);
+    # the job also caches the result, keeping disk writes off the loop
+    png_bytes = await _run_coalesced(
+        cache_key, _render_and_cache, cache_key, _generate_logo_sync, brand, style
     )
 
-    # Run Playwright in thread pool (sync API doesn't work in async)
-    png_bytes = await asyncio.to_thread(_generate_logo_sync, brand, style)
+    return _image_response(png_bytes, etag)
 
-    # Cache the result
-    _set_cached(cache_key, png_bytes)
 
-    return StreamingResponse(io.BytesIO(png_bytes), media_type="image/png")
+def _generate_og_preview_sync(brand: BrandIdentity, style: StyleConfig) -> bytes:
+    """Generate the OG preview JPEG in sync context (for thread pool).
 
-
-def _generate_og_sync(brand: BrandIdentity, style: StyleConfig) -> bytes:
-    """Generate OG image in sync context (for thread pool)."""
-    generator = HTMLGenerator(brand, style=style)
-    img = generator.generate_og_image()
-    buffer = io.BytesIO()
-    img.save(buffer, format="PNG")
-    return buffer.getvalue()
+    The same render's PNG is cached under /download's key, so a kit
+    download after a preview reuses it.
+    """
+    generator = _html_generator(brand, style)
+    png, jpeg = generator.render_og_png_and_jpeg()
+    _set_cached_image(_cache_key("og", brand, style), png)
+    return jpeg
 
 
-@app.get("/preview/og")
+@app.get(
+    "/preview/og",
+    response_class=Response,
+    responses={200: {"content": {"image/jpeg": {}}, "description": "OG image preview"}},
+)
 async def preview_og(
-    name: str = Query(...),
-    tagline: str = Query(""),
-    primary: str = Query("#333333"),
-    accent: str = Query("#666666"),
-    background: str = Query("#ffffff"),
-    text: str = Query("#ffffff"),
-    theme: str = Query("light"),
-    glow: float = Query(1.0),
-    depth: float = Query(1.0),
-    decoration: float = Query(1.0),
-    gradientAngle: int = Query(160),
-    font: str = Query("Inter"),
-    fontWeight: int = Query(800),
-    showAccentLine: str = Query("true"),
-    showBottomBar: str = Query("true"),
-    showBlobs: str = Query("true"),
-    showGlow: str = Query("true"),
-    bgEffect: str = Query("aurora"),
+    request: Request,
+    params: OGParams = Depends(),
 ):
-    """Generate OG image preview PNG (with caching)."""
-    cache_key = _cache_key("og", name, tagline, primary, accent, background, text, theme,
-                          glow, depth, decoration, gradientAngle, font, fontWeight,
-                          showAccentLine, showBottomBar, showBlobs, showGlow, bgEffect)
+    """Generate OG image preview JPEG (with caching).
 
-    # Check cache first
-    cached = _get_cached(cache_key)
-    if cached:
-        return StreamingResponse(io.BytesIO(cached), media_type="image/png")
-
-    brand = create_brand_identity(
-        name=name,
-        tagline=tagline,
-        primary=primary,
-        accent=accent,
-        background=background,
-        text=text,
-        theme=theme,
-    )
-    style = create_style_config(
-        glow=glow,
-        depth=depth,
-        decoration=decoration,
-        gradient_angle=gradientAngle,
-        font=font,
-        font_weight=fontWeight,
-        show_accent_line=showAccentLine,
-        show_bottom_bar=showBottomBar,
-        show_blobs=showBlobs,
-        show_glow=showGlow,
-        bg_effect=bgEffect,
-    )
-
-    # Run Playwright in thread pool (sync API doesn't work in async)
-    png_bytes = await asyncio.to_thread(_generate_og_sync, brand, style)
-
-    # Cache the result
-    _set_cached(cache_key, png_bytes)
+    The OG image is opaque, so the preview is served as JPEG, encoded by
+    Chromium; /download packs the PNG from the same render.
+    """
+    brand = params.brand()
+    style = params.style()
 
-    return StreamingResponse(io.BytesIO(png_bytes), media_type="image/png")
+    cache_key = _cache_key("og.jpg", brand, style)
 
+    # The cache key fully determines the image, so it doubles as the ETag
+    etag = f'"{cache_key}"'
+    if _etag_matches(request, etag):
+        return _not_modified(etag)
 
-def _generate_zip_sync(brand: BrandIdentity, style: StyleConfig) -> bytes:
-    """Generate ZIP in sync context (for thread pool)."""
-    import tempfile
+    # Check cache first
+    cached = await _lookup_image(cache_key)
+    if cached:
+        return _image_response(cached, etag, media_type="image/jpeg")
 
-    generator = HTMLGenerator(brand, style=style)
-    logo = generator.generate_logo(size=512)
-    og_image = generator.generate_og_image()
+    # Run Playwright on the render pool (sync API doesn't work in async);
+    # the job also caches the result, keeping disk writes off the loop
+    jpeg_bytes = await _run_coalesced(
+        cache_key, _render_and_cache, cache_key, _generate_og_preview_sync, brand, style
+    )
 
-    zip_buffer = io.BytesIO()
+    return _image_response(jpeg_bytes, etag, media_type="image/jpeg")
 
-    with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zf:
-        with tempfile.TemporaryDirectory() as tmpdir:
-            tmpdir = Path(tmpdir)
-            generated = build_favicon_set(
-                source=logo,
-                output_dir=tmpdir,
-                theme_color=brand.primary_color,
-                verbose=False,
-            )
-            for filepath in generated.values():
-                zf.write(filepath, filepath.name)
 
-        og_buffer = io.BytesIO()
-        og_image.save(og_buffer, format="PNG")
-        zf.writestr("og-image.png", og_buffer.getvalue())
+# Already-compressed formats; deflating them again burns CPU for ~1%
+_STORED_SUFFIXES = (".png", ".ico")
 
-        manifest = f'''{{"name":"{brand.name}","short_name":"{brand.name}","icons":[{{"src":"android-chrome-192x192.png","sizes":"192x192","type":"image/png"}},{{"src":"android-chrome-512x512.png","sizes":"512x512","type":"image/png"}}],"theme_color":"{brand.primary_color}","background_color":"{brand.background_color}","display":"standalone"}}'''
-        zf.writestr("site.webmanifest", manifest)
+# Static parts of the kit's site.webmanifest and README
+_MANIFEST_ICONS = [
+    {"src": "android-chrome-192x192.png", "sizes": "192x192", "type": "image/png"},
+    {"src": "android-chrome-512x512.png", "sizes": "512x512", "type": "image/png"},
+]
 
-        readme = f"""# {brand.name} Brand Kit
+_KIT_README_TEMPLATE = """# {name} Brand Kit
 
 ## Files Included
 - favicon.ico (16, 32, 48px multi-size)
@@ -454,75 +548,112 @@ Add to your HTML <head>:
 <link rel="icon" type="image/png" sizes="16x16" href="/favicon-16x16.png">
 <link rel="apple-touch-icon" sizes="180x180" href="/apple-touch-icon.png">
 <link rel="manifest" href="/site.webmanifest">
-<meta name="theme-color" content="{brand.primary_color}">
+<meta name="theme-color" content="{primary}">
 <meta property="og:image" content="/og-image.png">
 ```
 
 ## Colors
-- Primary: {brand.primary_color}
-- Accent: {brand.accent_color}
-- Background: {brand.background_color}
+- Primary: {primary}
+- Accent: {accent}
+- Background: {background}
 
 Generated with Brand Kit Generator
 """
-        zf.writestr("README.md", readme)
 
-    return zip_buffer.getvalue()
+
+def _generate_kit_sync(brand: BrandIdentity, style: StyleConfig) -> Dict[str, bytes]:
+    """Render all brand kit files in sync context (for thread pool).
+
+    Returns archive name -> file contents; _stream_zip packs them.
+    """
+    generator = _html_generator(brand, style)
+
+    # Reuse a preview's or an earlier download's OG render for this brand + style
+    og_key = _cache_key("og", brand, style)
+    og_png = _get_cached_image(og_key)
+
+    if og_png is None:
+        # One batch on this worker's browser: both pages load in parallel
+        logo, og_png = generator.generate_logo_and_og_image(logo_size=512, og_bytes=True)
+        _set_cached_image(og_key, og_png)
+    else:
+        logo = generator.generate_logo(size=512)
+
+    files = encode_favicon_set(source=logo, theme_color=brand.primary_color)
+    files["og-image.png"] = og_png
+
+    manifest = {
+        "name": brand.name,
+        "short_name": brand.name,
+        "icons": _MANIFEST_ICONS,
+        "theme_color": brand.primary_color,
+        "background_color": brand.background_color,
+        "display": "standalone",
+    }
+    # Replaces the name-less manifest encode_favicon_set made
+    files["site.webmanifest"] = json.dumps(manifest, separators=(",", ":")).encode()
+
+    readme = _KIT_README_TEMPLATE.format_map({
+        "name": brand.name,
+        "primary": brand.primary_color,
+        "accent": brand.accent_color,
+        "background": brand.background_color,
+    })
+    files["README.md"] = readme.encode()
+
+    return files
+
+
+class _ChunkSink(io.RawIOBase):
+    """Unseekable write target that hands back whatever was written."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self._chunks.append(bytes(b))
+        return len(b)
+
+    def drain(self) -> bytes:
+        chunk = b"".join(self._chunks)
+        self._chunks.clear()
+        return chunk
+
+
+def _stream_zip(files: Dict[str, bytes]) -> Iterator[bytes]:
+    """Yield a ZIP archive of files piece by piece.
+
+    zipfile falls back to data descriptors on an unseekable target, so
+    each entry can be sent as soon as it is compressed and the whole
+    archive never sits in memory.
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, data in files.items():
+            compress_type = zipfile.ZIP_STORED if name.endswith(_STORED_SUFFIXES) else None
+            zf.writestr(name, data, compress_type=compress_type)
+            yield sink.drain()
+    # Central directory, written on close
+    yield sink.drain()
 
 
 @app.get("/download")
-async def download_zip(
-    name: str = Query(...),
-    tagline: str = Query(""),
-    primary: str = Query("#333333"),
-    accent: str = Query("#666666"),
-    background: str = Query("#ffffff"),
-    text: str = Query("#ffffff"),
-    theme: str = Query("light"),
-    glow: float = Query(1.0),
-    depth: float = Query(1.0),
-    decoration: float = Query(1.0),
-    gradientAngle: int = Query(160),
-    font: str = Query("Inter"),
-    fontWeight: int = Query(800),
-    showAccentLine: str = Query("true"),
-    showBottomBar: str = Query("true"),
-    showBlobs: str = Query("true"),
-    showGlow: str = Query("true"),
-    bgEffect: str = Query("aurora"),
-):
+async def download_zip(params: OGParams = Depends()):
     """Generate and download ZIP with all brand assets."""
-    brand = create_brand_identity(
-        name=name,
-        tagline=tagline,
-        primary=primary,
-        accent=accent,
-        background=background,
-        text=text,
-        theme=theme,
-    )
-    style = create_style_config(
-        glow=glow,
-        depth=depth,
-        decoration=decoration,
-        gradient_angle=gradientAngle,
-        font=font,
-        font_weight=fontWeight,
-        show_accent_line=showAccentLine,
-        show_bottom_bar=showBottomBar,
-        show_blobs=showBlobs,
-        show_glow=showGlow,
-        bg_effect=bgEffect,
-    )
+    brand = params.brand()
+    style = params.style()
 
-    # Run in thread pool (Playwright sync API)
-    zip_bytes = await asyncio.to_thread(_generate_zip_sync, brand, style)
+    # Run on the render pool (Playwright sync API)
+    files = await _run_coalesced(("zip", brand, style), _generate_kit_sync, brand, style)
 
     # Create safe filename
-    safe_name = "".join(c if c.isalnum() else "-" for c in brand.name.lower())
+    safe_name = _UNSAFE_FILENAME_RE.sub("-", brand.name.lower()).strip("-") or "brand"
 
     return StreamingResponse(
-        io.BytesIO(zip_bytes),
+        _stream_zip(files),
         media_type="application/zip",
         headers={
             "Content-Disposition": f'attachment; filename="{safe_name}-brand-kit.zip"'
@@ -8,21 +8,41 @@ Usage:
     python brand_kit_gen.py https://example.com --output ./static/
     python brand_kit_gen.py https://example.com --ai --output ./static/
     python brand_kit_gen.py https://example.com --style gradient -v
+    python brand_kit_gen.py --batch urls.txt --output ./kits/
 """
 import argparse
+import atexit
+import base64
+import dataclasses
+import hashlib
+import json
+import os
+import re
 import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from html import escape
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
 
 from extractors.color_extractor import ColorExtractor
 from extractors.brand_extractor import BrandExtractor
-from generators.pil_generator import PILGenerator
-from generators.favicon_builder import build_favicon_set
-from generators.ai_generator import AIGenerator
-from generators.html_generator import HTMLGenerator, is_playwright_available
+from generators.favicon_builder import encode_favicon_set, encode_png, write_favicon_set
 from models.brand_identity import BrandIdentity, StyleConfig, MOOD_PRESETS, BG_EFFECTS
+from utils.http import SESSION, fetch_text
+
+
+# Where --serve listens and --client connects
+DEFAULT_SOCKET = os.path.join(tempfile.gettempdir(), 'brand-kit-gen.sock')
 
 
-def parse_args():
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description='Generate brand kit (favicons + OG image) from website URL',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -32,6 +52,9 @@ Examples:
   %(prog)s https://example.com --method pil       # PIL fallback
   %(prog)s https://example.com --ai               # AI generation
   %(prog)s https://example.com --method pil --style gradient
+  %(prog)s --batch urls.txt -o ./kits             # One kit per URL in the file
+  %(prog)s --serve                                # Daemon with warm browser
+  %(prog)s https://example.com --client           # Run job on the daemon
 
 Methods:
   html - HTML/Playwright rendering (default, best quality, FREE)
@@ -52,6 +75,7 @@ AI Providers (--ai):
 
     parser.add_argument(
         'url',
+        nargs='?',
         help='Website URL to analyze'
     )
 
@@ -99,6 +123,24 @@ AI Providers (--ai):
         help='Verbose output'
     )
 
+    parser.add_argument(
+        '--optimize',
+        action='store_true',
+        help='Write smallest PNGs (slower); default is fast compression for iterating'
+    )
+
+    parser.add_argument(
+        '--refresh',
+        action='store_true',
+        help='Re-scrape the website even if a cached extraction exists'
+    )
+
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Neither read nor write the extraction cache'
+    )
+
     # Manual overrides
     parser.add_argument(
         '--name',
@@ -171,7 +213,217 @@ AI Providers (--ai):
         help='Background effect style (default: aurora). Options: ' + ', '.join(BG_EFFECTS.keys())
     )
 
-    return parser.parse_args()
+    parser.add_argument(
+        '--batch', type=Path, metavar='FILE',
+        help='Generate a kit for every URL in FILE (one per line) into OUTPUT/<site>/'
+    )
+
+    # Daemon mode
+    parser.add_argument(
+        '--serve', action='store_true',
+        help='Run as a daemon that keeps the browser and caches warm and runs --client jobs'
+    )
+    parser.add_argument(
+        '--client', action='store_true',
+        help='Send this job to a running --serve daemon instead of running it here'
+    )
+    parser.add_argument(
+        '--socket', default=DEFAULT_SOCKET,
+        help=f'Unix socket for --serve/--client (default: {DEFAULT_SOCKET})'
+    )
+
+    return parser
+
+
+def parse_args(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not args.url and not args.serve and not args.batch:
+        parser.error('the following arguments are required: url')
+    if args.batch and args.client:
+        parser.error('--batch runs locally; it cannot be combined with --client')
+    return args
+
+
+# Scraped color/brand data per URL, so re-runs while tweaking styles skip the network
+EXTRACTION_CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'brand-kit-gen'
+EXTRACTION_CACHE_TTL = 24 * 60 * 60  # seconds
+
+
+def _extraction_cache_path(url: str) -> Path:
+    return EXTRACTION_CACHE_DIR / f"{hashlib.sha1(url.encode()).hexdigest()}.json"
+
+
+def load_cached_extraction(url: str) -> Optional[Tuple[dict, dict]]:
+    """Get cached (color_data, brand_data) for url, if younger than the TTL."""
+    try:
+        cached = json.loads(_extraction_cache_path(url).read_text())
+        if time.time() - cached['fetched_at'] > EXTRACTION_CACHE_TTL:
+            return None
+        return cached['color_data'], cached['brand_data']
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def save_cached_extraction(url: str, color_data: dict, brand_data: dict):
+    """Cache a successful extraction for url (best effort)."""
+    # Don't pin a transient network failure for a whole TTL
+    if 'error' in color_data or 'error' in brand_data:
+        return
+
+    path = _extraction_cache_path(url)
+    entry = {
+        'url': url,
+        'fetched_at': time.time(),
+        'color_data': color_data,
+        'brand_data': brand_data,
+    }
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps(entry))
+        tmp_path.replace(path)
+    except OSError:
+        pass
+
+
+# Third-party assets inlined into preview.html so opening it (and every live
+# preview update) needs no network. Version-pinned, so cached indefinitely.
+PICO_CSS_URL = 'https://cdn.jsdelivr.net/npm/@picocss/pico@2/css/pico.min.css'
+INTER_FONT_URL = 'https://cdn.jsdelivr.net/npm/@fontsource/inter@5/files/inter-latin-800-normal.woff2'
+INTER_IMPORT_CSS = '@import url("https://fonts.googleapis.com/css2?family=Inter:wght@800&display=swap");'
+
+
+def fetch_cached_asset(url: str, filename: str) -> Optional[bytes]:
+    """Get url's content from the local cache, downloading it on first use.
+
+    Returns None when it isn't cached and can't be downloaded.
+    """
+    path = EXTRACTION_CACHE_DIR / filename
+    try:
+        return path.read_bytes()
+    except OSError:
+        pass
+
+    try:
+        response = SESSION.get(url, timeout=10)
+        response.raise_for_status()
+    except requests.RequestException:
+        return None
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp')
+        tmp_path.write_bytes(response.content)
+        tmp_path.replace(path)
+    except OSError:
+        pass
+    return response.content
+
+
+def preview_asset_fields() -> dict:
+    """Get the preview fields for Pico CSS (a tag) and the Inter font (CSS).
+
+    Falls back to the CDN links when the assets can't be fetched.
+    """
+    pico_css = fetch_cached_asset(PICO_CSS_URL, 'pico.min.css')
+    if pico_css is not None:
+        pico_tag = f'<style>{pico_css.decode("utf-8")}</style>'
+    else:
+        pico_tag = f'<link rel="stylesheet" href="{PICO_CSS_URL}">'
+
+    inter_font = fetch_cached_asset(INTER_FONT_URL, 'inter-800.woff2')
+    if inter_font is not None:
+        font_data = base64.b64encode(inter_font).decode('ascii')
+        inter_css = ('@font-face{font-family:Inter;font-weight:800;'
+                     f'src:url(data:font/woff2;base64,{font_data}) format("woff2")}}')
+    else:
+        inter_css = INTER_IMPORT_CSS
+
+    return {'pico_css': pico_tag, 'inter_font_css': inter_css}
+
+
+# Probing a Playwright without Chromium still starts its driver, on every run.
+# A failed probe is remembered for a day, or until the Python interpreter or
+# the installed browsers change (e.g. after `playwright install chromium`).
+PLAYWRIGHT_PROBE_PATH = EXTRACTION_CACHE_DIR / 'playwright-unavailable.json'
+PLAYWRIGHT_PROBE_TTL = 24 * 60 * 60  # seconds
+
+
+def _playwright_browsers_dir() -> Path:
+    if os.environ.get('PLAYWRIGHT_BROWSERS_PATH'):
+        return Path(os.environ['PLAYWRIGHT_BROWSERS_PATH'])
+    if sys.platform == 'darwin':
+        return Path.home() / 'Library' / 'Caches' / 'ms-playwright'
+    if sys.platform == 'win32':
+        return Path(os.environ.get('LOCALAPPDATA', Path.home())) / 'ms-playwright'
+    return Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'ms-playwright'
+
+
+def _playwright_probe_signature() -> list:
+    signature = [sys.executable]
+    for path in (Path(sys.executable), _playwright_browsers_dir()):
+        try:
+            signature.append(path.stat().st_mtime)
+        except OSError:
+            signature.append(None)
+    return signature
+
+
+@lru_cache(maxsize=1)
+def html_method_available() -> bool:
+    """Check whether Playwright can render here, at most once per process."""
+    signature = _playwright_probe_signature()
+    try:
+        cached = json.loads(PLAYWRIGHT_PROBE_PATH.read_text())
+        if (cached['signature'] == signature
+                and time.time() - cached['checked_at'] < PLAYWRIGHT_PROBE_TTL):
+            return False
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    # Imported here so the other methods don't pay for loading Playwright
+    from generators.html_generator import is_playwright_available
+
+    available = is_playwright_available()
+    try:
+        if available:
+            PLAYWRIGHT_PROBE_PATH.unlink(missing_ok=True)
+        else:
+            PLAYWRIGHT_PROBE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            PLAYWRIGHT_PROBE_PATH.write_text(json.dumps({
+                'signature': signature,
+                'checked_at': time.time(),
+            }))
+    except OSError:
+        pass
+    return available
+
+
+# Shared by all jobs in the process (batch, daemon); both fetch through the
+# pooled utils.http.SESSION and hold no other state.
+_COLOR_EXTRACTOR = ColorExtractor()
+_BRAND_EXTRACTOR = BrandExtractor()
+
+
+def scrape_brand_data(url: str) -> Tuple[dict, dict]:
+    """Fetch url and extract (color_data, brand_data) from it."""
+    # Download the page once and hand it to both extractors
+    try:
+        html = fetch_text(url, _COLOR_EXTRACTOR.timeout, _COLOR_EXTRACTOR.session)
+    except requests.RequestException:
+        html = None
+
+    # Run both concurrently; color extraction still fetches stylesheets
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        if html is not None:
+            color_future = executor.submit(_COLOR_EXTRACTOR.extract_from_html, html, url)
+            brand_future = executor.submit(_BRAND_EXTRACTOR.extract_from_html, html, url)
+        else:
+            # Let each extractor retry and report its own error
+            color_future = executor.submit(_COLOR_EXTRACTOR.extract_from_url, url)
+            brand_future = executor.submit(_BRAND_EXTRACTOR.extract_from_url, url)
+        return color_future.result(), brand_future.result()
 
 
 def extract_brand_identity(url: str, args, verbose: bool = False) -> BrandIdentity:
@@ -179,9 +431,16 @@ def extract_brand_identity(url: str, args, verbose: bool = False) -> BrandIdenti
     if verbose:
         print(f"\n📊 Analyzing {url}...")
 
-    # Extract colors
-    color_extractor = ColorExtractor()
-    color_data = color_extractor.extract_from_url(url)
+    use_cache = not args.no_cache
+    cached = load_cached_extraction(url) if use_cache and not args.refresh else None
+    if cached:
+        color_data, brand_data = cached
+        if verbose:
+            print("  Using cached extraction (--refresh to re-scrape)")
+    else:
+        color_data, brand_data = scrape_brand_data(url)
+        if use_cache:
+            save_cached_extraction(url, color_data, brand_data)
 
     if verbose:
         if 'error' in color_data:
@@ -191,12 +450,6 @@ def extract_brand_identity(url: str, args, verbose: bool = False) -> BrandIdenti
         print(f"  Accent: {color_data.get('accent', 'N/A')}")
         print(f"  Background: {color_data.get('background', 'N/A')}")
         print(f"  Theme: {color_data.get('theme', 'N/A')}")
-
-    # Extract brand info
-    brand_extractor = BrandExtractor()
-    brand_data = brand_extractor.extract_from_url(url)
-
-    if verbose:
         if 'error' in brand_data:
             print(f"  ⚠️  Brand extraction warning: {brand_data['error']}")
         print(f"  Name: {brand_data.get('name', 'N/A')}")
@@ -208,7 +461,7 @@ def extract_brand_identity(url: str, args, verbose: bool = False) -> BrandIdenti
     brand = BrandIdentity(
         name=args.name or brand_data.get('name', 'Brand'),
         domain=brand_data.get('domain', ''),
-        colors=color_data.get('colors', []),
+        colors=tuple(color_data.get('colors', [])),
         primary_color=args.primary or color_data.get('primary', '#333333'),
         accent_color=args.accent or color_data.get('accent', '#666666'),
         background_color=args.background or color_data.get('background', '#ffffff'),
@@ -228,25 +481,12 @@ def extract_brand_identity(url: str, args, verbose: bool = False) -> BrandIdenti
 
 def build_style_config(args) -> StyleConfig:
     """Build StyleConfig from CLI arguments."""
-    # Start with mood preset or default
+    # Start with mood preset or default; presets are frozen, so deriving
+    # from them directly can't modify them
     if args.mood:
-        style = MOOD_PRESETS[args.mood]
-        # Create new instance to avoid modifying preset
-        style = StyleConfig(
-            glow=style.glow,
-            depth=style.depth,
-            decoration=style.decoration,
-            gradient_angle=style.gradient_angle,
-            font=style.font,
-            font_weight=style.font_weight,
-            show_accent_line=style.show_accent_line,
-            show_bottom_bar=style.show_bottom_bar,
-            show_blobs=style.show_blobs,
-            show_glow=style.show_glow,
-            bg_effect=style.bg_effect,
-        )
+        base = MOOD_PRESETS[args.mood]
     else:
-        style = StyleConfig(
+        base = StyleConfig(
             glow=args.glow,
             depth=args.depth,
             decoration=args.decoration,
@@ -254,23 +494,26 @@ def build_style_config(args) -> StyleConfig:
             bg_effect=args.bg_effect,
         )
 
-    # Apply explicit overrides (font, toggles)
-    style.font = args.font
-    style.font_weight = args.font_weight
-    style.show_accent_line = not args.no_accent_line
-    style.show_bottom_bar = not args.no_bottom_bar
-    style.show_blobs = not args.no_blobs
-    style.show_glow = not args.no_glow
-
     # If bg_effect was explicitly set via CLI, override mood preset
-    if hasattr(args, 'bg_effect') and args.bg_effect != 'aurora':
-        style.bg_effect = args.bg_effect
+    bg_effect = args.bg_effect if args.bg_effect != 'aurora' else base.bg_effect
 
-    return style
+    # Apply explicit overrides (font, toggles)
+    return dataclasses.replace(
+        base,
+        font=args.font,
+        font_weight=args.font_weight,
+        show_accent_line=not args.no_accent_line,
+        show_bottom_bar=not args.no_bottom_bar,
+        show_blobs=not args.no_blobs,
+        show_glow=not args.no_glow,
+        bg_effect=bg_effect,
+    )
 
 
 def generate_with_html(brand: BrandIdentity, args) -> tuple:
     """Generate logo and OG image using HTML/Playwright."""
+    from generators.html_generator import HTMLGenerator
+
     if args.verbose:
         print(f"\n🌐 Generating with HTML/Playwright...")
 
@@ -281,14 +524,15 @@ def generate_with_html(brand: BrandIdentity, args) -> tuple:
 
     generator = HTMLGenerator(brand, style=style)
 
-    logo = generator.generate_logo(size=512)
-    og_image = generator.generate_og_image()
-
-    return logo, og_image
+    # Both renders at once, sharing one browser context. Unless optimizing,
+    # the OG image is only written out, so keep Chromium's PNG bytes.
+    return generator.generate_logo_and_og_image(logo_size=512, og_bytes=not args.optimize)
 
 
 def generate_with_pil(brand: BrandIdentity, args) -> tuple:
     """Generate logo and OG image using PIL."""
+    from generators.pil_generator import PILGenerator
+
     if args.verbose:
         print(f"\n🖼️  Generating with PIL (style: {args.style})...")
 
@@ -302,6 +546,8 @@ def generate_with_pil(brand: BrandIdentity, args) -> tuple:
 
 def generate_with_ai(brand: BrandIdentity, args) -> tuple:
     """Generate logo and OG image using AI."""
+    from generators.ai_generator import AIGenerator
+
     if args.verbose:
         print(f"\n🤖 Generating with AI...")
 
@@ -313,38 +559,19 @@ def generate_with_ai(brand: BrandIdentity, args) -> tuple:
     return logo, og_image
 
 
-def generate_preview_html(output_dir: Path, brand: BrandIdentity, source_url: str, style: StyleConfig = None) -> Path:
-    """Generate HTML preview page showing all generated assets with live OG preview."""
-    from html import escape
-    import json
+# preview.html is written from these sections in order (see _PREVIEW_SECTIONS);
+# their str.format fields are filled in by generate_preview_html.
 
-    # Build effect options HTML
-    effect_options = '\n'.join([
-        f'<option value="{effect}" {"selected" if style and style.bg_effect == effect else ""}>{escape(effect)} - {escape(desc)}</option>'
-        for effect, desc in BG_EFFECTS.items()
-    ])
-
-    # Safely encode data for JS
-    brand_json = json.dumps({
-        'name': brand.name,
-        'primary': brand.primary_color,
-        'accent': brand.accent_color,
-        'background': brand.background_color,
-        'text': brand.text_color,
-        'tagline': brand.tagline or ''
-    })
-    effects_json = json.dumps(dict(BG_EFFECTS))
-    source_url_json = json.dumps(source_url)
-
-    html = f'''<!DOCTYPE html>
+# Document head, styles and page header
+_PREVIEW_HEADER = '''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Brand Kit Preview - {escape(brand.name)}</title>
-    <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/@picocss/pico@2/css/pico.min.css">
+    <title>Brand Kit Preview - {name}</title>
+    {pico_css}
     <style>
-        :root {{ --pico-primary: {brand.primary_color}; --pico-primary-hover: {brand.accent_color}; }}
+        :root {{ --pico-primary: {primary}; --pico-primary-hover: {accent}; }}
         body {{ padding: 2rem; }}
         .color-swatch {{ display: inline-flex; flex-direction: column; align-items: center; margin: 0.5rem; }}
         .color-box {{ width: 80px; height: 80px; border-radius: 8px; border: 2px solid #ccc; margin-bottom: 0.5rem; }}
@@ -370,22 +597,28 @@ def generate_preview_html(output_dir: Path, brand: BrandIdentity, source_url: st
 <body>
     <main class="container">
         <header>
-            <h1>{escape(brand.name)}</h1>
-            <p>Brand kit generated from <a href="{escape(source_url)}" target="_blank">{escape(source_url)}</a></p>
+            <h1>{name}</h1>
+            <p>Brand kit generated from <a href="{source_url}" target="_blank">{source_url}</a></p>
         </header>
 
-        <section>
+'''
+
+# Extracted color swatches
+_PREVIEW_COLORS = '''        <section>
             <h2>Colors</h2>
             <div>
-                <div class="color-swatch"><div class="color-box" style="background: {brand.primary_color};"></div><small>Primary</small><code>{brand.primary_color}</code></div>
-                <div class="color-swatch"><div class="color-box" style="background: {brand.accent_color};"></div><small>Accent</small><code>{brand.accent_color}</code></div>
-                <div class="color-swatch"><div class="color-box" style="background: {brand.background_color};"></div><small>Background</small><code>{brand.background_color}</code></div>
-                <div class="color-swatch"><div class="color-box" style="background: {brand.text_color};"></div><small>Text</small><code>{brand.text_color}</code></div>
+                <div class="color-swatch"><div class="color-box" style="background: {primary};"></div><small>Primary</small><code>{primary}</code></div>
+                <div class="color-swatch"><div class="color-box" style="background: {accent};"></div><small>Accent</small><code>{accent}</code></div>
+                <div class="color-swatch"><div class="color-box" style="background: {background};"></div><small>Background</small><code>{background}</code></div>
+                <div class="color-swatch"><div class="color-box" style="background: {text};"></div><small>Text</small><code>{text}</code></div>
             </div>
-            <p><small>Theme: <strong>{brand.theme}</strong></small></p>
+            <p><small>Theme: <strong>{theme}</strong></small></p>
         </section>
 
-        <section>
+'''
+
+# Generated logo, favicons and OG image
+_PREVIEW_ASSETS = '''        <section>
             <h2>Logo</h2>
             <p><small>512x512 source image</small></p>
             <img src="android-chrome-512x512.png" width="256" height="256" alt="Logo" style="border-radius: 20%; background: repeating-conic-gradient(#eee 0% 25%, #fff 0% 50%) 50% / 10px 10px;">
@@ -408,16 +641,19 @@ def generate_preview_html(output_dir: Path, brand: BrandIdentity, source_url: st
             <img src="og-image.png" alt="OG Image" class="og-preview" id="og-static">
         </section>
 
-        <section>
+'''
+
+# Live OG preview controls
+_PREVIEW_LIVE = '''        <section>
             <h2>Live OG Preview</h2>
             <p><small>Experiment with background effects. Changes are preview only - regenerate to save.</small></p>
 
             <div class="controls">
                 <div><label>Effect</label><select id="bg-effect">{effect_options}</select></div>
-                <div><label>Decoration <span class="slider-value" id="dec-val">{style.decoration if style else 1.0}</span></label><input type="range" id="decoration" min="0" max="2" step="0.1" value="{style.decoration if style else 1.0}"></div>
-                <div><label>Glow <span class="slider-value" id="glow-val">{style.glow if style else 1.0}</span></label><input type="range" id="glow" min="0" max="2" step="0.1" value="{style.glow if style else 1.0}"></div>
-                <div><label>Depth <span class="slider-value" id="depth-val">{style.depth if style else 1.0}</span></label><input type="range" id="depth" min="0" max="2" step="0.1" value="{style.depth if style else 1.0}"></div>
-                <div><label>Angle <span class="slider-value" id="angle-val">{style.gradient_angle if style else 160}</span></label><input type="range" id="gradient-angle" min="0" max="360" step="5" value="{style.gradient_angle if style else 160}"></div>
+                <div><label>Decoration <span class="slider-value" id="dec-val">{decoration}</span></label><input type="range" id="decoration" min="0" max="2" step="0.1" value="{decoration}"></div>
+                <div><label>Glow <span class="slider-value" id="glow-val">{glow}</span></label><input type="range" id="glow" min="0" max="2" step="0.1" value="{glow}"></div>
+                <div><label>Depth <span class="slider-value" id="depth-val">{depth}</span></label><input type="range" id="depth" min="0" max="2" step="0.1" value="{depth}"></div>
+                <div><label>Angle <span class="slider-value" id="angle-val">{gradient_angle}</span></label><input type="range" id="gradient-angle" min="0" max="360" step="5" value="{gradient_angle}"></div>
             </div>
 
             <div class="effect-grid" id="effect-grid"></div>
@@ -425,7 +661,10 @@ def generate_preview_html(output_dir: Path, brand: BrandIdentity, source_url: st
             <p style="margin-top:1rem"><small>Regenerate command:</small><br><code id="regen-cmd"></code> <button class="copy-btn secondary" id="copy-btn">Copy</button></p>
         </section>
 
-        <section>
+'''
+
+# HTML snippet for using the kit
+_PREVIEW_USAGE = '''        <section>
             <h2>Usage</h2>
             <p>Add to your HTML head:</p>
             <pre><code>&lt;link rel="icon" type="image/x-icon" href="/favicon.ico"&gt;
@@ -433,171 +672,538 @@ def generate_preview_html(output_dir: Path, brand: BrandIdentity, source_url: st
 &lt;link rel="icon" type="image/png" sizes="16x16" href="/favicon-16x16.png"&gt;
 &lt;link rel="apple-touch-icon" sizes="180x180" href="/apple-touch-icon.png"&gt;
 &lt;link rel="manifest" href="/site.webmanifest"&gt;
-&lt;meta name="theme-color" content="{brand.primary_color}"&gt;
+&lt;meta name="theme-color" content="{primary}"&gt;
 &lt;meta property="og:image" content="/og-image.png"&gt;</code></pre>
         </section>
     </main>
-    <script>
+'''
+
+# Live preview script (mirrors the HTML generator in JS)
+_PREVIEW_SCRIPT = '''    <script>
     const brand = {brand_json};
     const effects = {effects_json};
     const sourceUrl = {source_url_json};
-
-    function hexToRgb(hex) {{
-        hex = hex.replace('#', '');
-        if (hex.length === 3) hex = hex.split('').map(c => c+c).join('');
-        return `${{parseInt(hex.substr(0,2),16)}}, ${{parseInt(hex.substr(2,2),16)}}, ${{parseInt(hex.substr(4,2),16)}}`;
-    }}
-
-    function blendColors(c1, c2, factor) {{
-        const h2r = h => {{ h = h.replace('#',''); if (h.length===3) h = h.split('').map(c=>c+c).join(''); return [parseInt(h.substr(0,2),16), parseInt(h.substr(2,2),16), parseInt(h.substr(4,2),16)]; }};
-        const [r1,g1,b1] = h2r(c1), [r2,g2,b2] = h2r(c2);
-        const r = Math.round(r1*(1-factor)+r2*factor), g = Math.round(g1*(1-factor)+g2*factor), b = Math.round(b1*(1-factor)+b2*factor);
-        return '#'+[r,g,b].map(x=>x.toString(16).padStart(2,'0')).join('');
-    }}
-
-    function getBgCss(effect, dec, angle) {{
-        const ar = hexToRgb(brand.accent), pr = hexToRgb(brand.primary), bg = brand.background;
-        const map = {{
-            'aurora': `radial-gradient(ellipse 700px 500px at 85% 15%, rgba(${{ar}},${{0.35*dec}}) 0%, transparent 70%), radial-gradient(ellipse 500px 400px at 10% 90%, rgba(${{pr}},${{0.25*dec}}) 0%, transparent 70%), radial-gradient(ellipse 800px 400px at 50% 50%, rgba(${{pr}},${{0.08*dec}}) 0%, transparent 60%), linear-gradient(${{angle}}deg, ${{bg}}, ${{blendColors(bg, brand.primary, 0.15)}})`,
-            'mesh': `radial-gradient(ellipse 600px 400px at 20% 20%, rgba(${{ar}},${{0.4*dec}}) 0%, transparent 60%), radial-gradient(ellipse 500px 500px at 80% 30%, rgba(${{pr}},${{0.35*dec}}) 0%, transparent 55%), radial-gradient(ellipse 400px 350px at 60% 70%, rgba(${{ar}},${{0.3*dec}}) 0%, transparent 50%), radial-gradient(ellipse 550px 400px at 10% 80%, rgba(${{pr}},${{0.25*dec}}) 0%, transparent 60%), linear-gradient(${{angle}}deg, ${{bg}}, ${{blendColors(bg, brand.primary, 0.1)}})`,
-            'spotlight': `radial-gradient(ellipse 1000px 800px at 95% 5%, rgba(${{ar}},${{0.5*dec}}) 0%, transparent 50%), radial-gradient(ellipse 600px 600px at 90% 10%, rgba(255,255,255,${{0.15*dec}}) 0%, transparent 40%), linear-gradient(${{angle}}deg, ${{bg}}, ${{blendColors(bg, '#000', 0.1)}})`,
-            'minimal': `linear-gradient(${{angle}}deg, ${{bg}}, ${{blendColors(bg, brand.primary, 0.08)}})`,
-            'diagonal': `linear-gradient(135deg, ${{bg}} 45%, ${{blendColors(brand.primary, bg, 0.5)}} 45%, ${{blendColors(brand.primary, bg, 0.5)}} 55%, ${{blendColors(bg, brand.accent, 0.2)}} 55%)`,
-            'noise': `linear-gradient(${{angle}}deg, ${{bg}}, ${{blendColors(bg, brand.primary, 0.2)}} 50%, ${{blendColors(bg, brand.accent, 0.15)}})`,
-            'waves': `linear-gradient(${{angle}}deg, ${{bg}}, ${{blendColors(bg, brand.primary, 0.1)}})`,
-            'glass': `linear-gradient(${{angle}}deg, ${{bg}}, ${{blendColors(bg, brand.primary, 0.15)}})`,
-            'dots': `linear-gradient(${{angle}}deg, ${{bg}}, ${{blendColors(bg, brand.primary, 0.1)}})`,
-            'geometric': `linear-gradient(${{angle}}deg, ${{bg}}, ${{blendColors(bg, brand.primary, 0.08)}})`
-        }};
-        return map[effect] || map['aurora'];
-    }}
-
-    function getExtraHtml(effect, dec) {{
-        const ar = hexToRgb(brand.accent), pr = hexToRgb(brand.primary);
-        if (effect === 'noise') return '<svg width="0" height="0" style="position:absolute"><filter id="grain"><feTurbulence type="fractalNoise" baseFrequency="0.65" numOctaves="3" stitchTiles="stitch"/><feColorMatrix type="saturate" values="0"/></filter></svg><div style="position:absolute;inset:0;filter:url(#grain);opacity:'+0.12*dec+';mix-blend-mode:overlay;z-index:2"></div>';
-        if (effect === 'waves') {{ const w1 = blendColors(brand.primary, brand.background, 0.7), w2 = blendColors(brand.accent, brand.background, 0.8); return '<svg style="position:absolute;bottom:0;left:0;width:100%;height:100%;z-index:1" viewBox="0 0 1200 630" preserveAspectRatio="none"><path d="M0,500 C200,450 400,550 600,480 C800,410 1000,520 1200,470 L1200,630 L0,630 Z" fill="'+w1+'" opacity="'+0.4*dec+'"/><path d="M0,530 C300,480 500,580 700,510 C900,440 1100,550 1200,500 L1200,630 L0,630 Z" fill="'+w2+'" opacity="'+0.3*dec+'"/><path d="M0,560 C250,520 450,600 650,550 C850,500 1050,580 1200,540 L1200,630 L0,630 Z" fill="'+brand.primary+'" opacity="'+0.2*dec+'"/></svg>'; }}
-        if (effect === 'glass') return '<div style="position:absolute;border-radius:50%;background:linear-gradient(135deg,rgba('+ar+','+0.3*dec+'),rgba('+pr+','+0.1*dec+'));filter:blur(40px);z-index:1;width:400px;height:400px;top:-100px;right:-50px"></div><div style="position:absolute;border-radius:50%;background:linear-gradient(135deg,rgba('+pr+','+0.25*dec+'),rgba('+ar+','+0.1*dec+'));filter:blur(40px);z-index:1;width:300px;height:300px;bottom:-80px;left:-60px"></div><div style="position:absolute;border-radius:50%;background:rgba(255,255,255,'+0.1*dec+');filter:blur(60px);z-index:1;width:200px;height:200px;top:40%;left:30%"></div>';
-        if (effect === 'dots') return '<div style="position:absolute;inset:0;background-image:radial-gradient(circle,rgba('+pr+','+0.15*dec+') 1.5px,transparent 1.5px);background-size:24px 24px;z-index:1"></div>';
-        if (effect === 'geometric') {{ const lc = blendColors(brand.primary, brand.background, 0.9); return '<div style="position:absolute;inset:0;background-image:linear-gradient(0deg,'+lc+' 1px,transparent 1px),linear-gradient(90deg,'+lc+' 1px,transparent 1px);background-size:60px 60px;z-index:1;opacity:'+0.5*dec+'"></div>'; }}
-        return '';
-    }}
-
-    function genHtml(effect, dec, glow, depth, angle) {{
-        const ar = hexToRgb(brand.accent), bgCss = getBgCss(effect, dec, angle), extra = getExtraHtml(effect, dec);
-        const tagline = brand.tagline ? '<p style="color:'+blendColors(brand.text, brand.accent, 0.3)+';font-size:26px;text-align:center;max-width:900px;opacity:0.85">'+brand.tagline+'</p>' : '';
-        return '<!DOCTYPE html><html><head><style>@import url("https://fonts.googleapis.com/css2?family=Inter:wght@800&display=swap");*{{margin:0;padding:0;box-sizing:border-box}}body{{width:1200px;height:630px;font-family:Inter,sans-serif;position:relative;overflow:hidden;background:'+bgCss+'}}.content{{position:absolute;inset:0;display:flex;flex-direction:column;justify-content:center;align-items:center;padding:60px 80px;z-index:10}}.brand-name{{color:'+brand.text+';font-size:88px;font-weight:800;letter-spacing:-3px;text-align:center;text-shadow:0 0 60px rgba('+ar+','+0.4*glow+'),0 0 30px rgba('+ar+','+0.2*glow+'),0 4px 12px rgba(0,0,0,'+0.4*depth+')}}.accent-line{{width:120px;height:4px;margin:24px 0;background:linear-gradient(90deg,transparent,'+brand.accent+' 20%,'+brand.accent+' 80%,transparent);border-radius:2px}}.accent-bar{{position:absolute;bottom:0;left:0;right:0;height:6px;background:linear-gradient(90deg,'+brand.primary+','+brand.accent+','+brand.primary+')}}</style></head><body>'+extra+'<div class="content"><h1 class="brand-name">'+brand.name+'</h1><div class="accent-line"></div>'+tagline+'</div><div class="accent-bar"></div></body></html>';
-    }}
-
-    function update() {{
-        const effect = document.getElementById('bg-effect').value;
-        const dec = parseFloat(document.getElementById('decoration').value);
-        const glow = parseFloat(document.getElementById('glow').value);
-        const depth = parseFloat(document.getElementById('depth').value);
-        const angle = parseInt(document.getElementById('gradient-angle').value);
-        document.getElementById('dec-val').textContent = dec.toFixed(1);
-        document.getElementById('glow-val').textContent = glow.toFixed(1);
-        document.getElementById('depth-val').textContent = depth.toFixed(1);
-        document.getElementById('angle-val').textContent = angle;
-        document.querySelectorAll('.effect-card').forEach(c => c.classList.toggle('active', c.dataset.effect === effect));
-        document.getElementById('og-preview').srcdoc = genHtml(effect, dec, glow, depth, angle);
-        let cmd = 'python brand_kit_gen.py ' + sourceUrl + ' --bg-effect ' + effect;
-        if (dec !== 1.0) cmd += ' --decoration ' + dec;
-        if (glow !== 1.0) cmd += ' --glow ' + glow;
-        if (depth !== 1.0) cmd += ' --depth ' + depth;
-        if (angle !== 160) cmd += ' --gradient-angle ' + angle;
-        document.getElementById('regen-cmd').textContent = cmd;
-    }}
-
-    const grid = document.getElementById('effect-grid');
-    for (const [e, d] of Object.entries(effects)) {{
-        const card = document.createElement('div');
-        card.className = 'effect-card';
-        card.dataset.effect = e;
-        const h4 = document.createElement('h4');
-        h4.textContent = e;
-        const p = document.createElement('p');
-        p.textContent = d;
-        card.appendChild(h4);
-        card.appendChild(p);
-        card.onclick = () => {{ document.getElementById('bg-effect').value = e; update(); }};
-        grid.appendChild(card);
-    }}
-
-    ['bg-effect','decoration','glow','depth','gradient-angle'].forEach(id => document.getElementById(id).addEventListener('input', update));
-    document.getElementById('copy-btn').onclick = () => navigator.clipboard.writeText(document.getElementById('regen-cmd').textContent);
-    update();
     </script>
+    <script src="preview.js"></script>
 </body>
 </html>'''
 
+# Written in this order
+_PREVIEW_SECTIONS = (
+    _PREVIEW_HEADER,
+    _PREVIEW_COLORS,
+    _PREVIEW_ASSETS,
+    _PREVIEW_LIVE,
+    _PREVIEW_USAGE,
+    _PREVIEW_SCRIPT,
+)
+
+# Live preview code, written to preview.js next to preview.html so it isn't
+# repeated in every page. Static apart from the interFontCss line put before it.
+_PREVIEW_JS = '''function hexToRgb(hex) {
+    hex = hex.replace('#', '');
+    if (hex.length === 3) hex = hex.split('').map(c => c+c).join('');
+    return `${parseInt(hex.substr(0,2),16)}, ${parseInt(hex.substr(2,2),16)}, ${parseInt(hex.substr(4,2),16)}`;
+}
+
+function blendColors(c1, c2, factor) {
+    const h2r = h => { h = h.replace('#',''); if (h.length===3) h = h.split('').map(c=>c+c).join(''); return [parseInt(h.substr(0,2),16), parseInt(h.substr(2,2),16), parseInt(h.substr(4,2),16)]; };
+    const [r1,g1,b1] = h2r(c1), [r2,g2,b2] = h2r(c2);
+    const r = Math.round(r1*(1-factor)+r2*factor), g = Math.round(g1*(1-factor)+g2*factor), b = Math.round(b1*(1-factor)+b2*factor);
+    return '#'+[r,g,b].map(x=>x.toString(16).padStart(2,'0')).join('');
+}
+
+// Colors derived from the brand only, so computed once rather than per slider input
+const ar = hexToRgb(brand.accent), pr = hexToRgb(brand.primary), bg = brand.background;
+const palette = {
+    bgPrimary08: blendColors(bg, brand.primary, 0.08),
+    bgPrimary10: blendColors(bg, brand.primary, 0.1),
+    bgPrimary15: blendColors(bg, brand.primary, 0.15),
+    bgPrimary20: blendColors(bg, brand.primary, 0.2),
+    bgAccent15: blendColors(bg, brand.accent, 0.15),
+    bgAccent20: blendColors(bg, brand.accent, 0.2),
+    bgBlack10: blendColors(bg, '#000', 0.1),
+    primaryBg50: blendColors(brand.primary, bg, 0.5),
+    primaryBg70: blendColors(brand.primary, bg, 0.7),
+    primaryBg90: blendColors(brand.primary, bg, 0.9),
+    accentBg80: blendColors(brand.accent, bg, 0.8),
+    textAccent30: blendColors(brand.text, brand.accent, 0.3),
+};
+
+// Only the selected effect's CSS is built
+const bgCss = {
+    'aurora': (dec, angle) => `radial-gradient(ellipse 700px 500px at 85% 15%, rgba(${ar},${0.35*dec}) 0%, transparent 70%), radial-gradient(ellipse 500px 400px at 10% 90%, rgba(${pr},${0.25*dec}) 0%, transparent 70%), radial-gradient(ellipse 800px 400px at 50% 50%, rgba(${pr},${0.08*dec}) 0%, transparent 60%), linear-gradient(${angle}deg, ${bg}, ${palette.bgPrimary15})`,
+    'mesh': (dec, angle) => `radial-gradient(ellipse 600px 400px at 20% 20%, rgba(${ar},${0.4*dec}) 0%, transparent 60%), radial-gradient(ellipse 500px 500px at 80% 30%, rgba(${pr},${0.35*dec}) 0%, transparent 55%), radial-gradient(ellipse 400px 350px at 60% 70%, rgba(${ar},${0.3*dec}) 0%, transparent 50%), radial-gradient(ellipse 550px 400px at 10% 80%, rgba(${pr},${0.25*dec}) 0%, transparent 60%), linear-gradient(${angle}deg, ${bg}, ${palette.bgPrimary10})`,
+    'spotlight': (dec, angle) => `radial-gradient(ellipse 1000px 800px at 95% 5%, rgba(${ar},${0.5*dec}) 0%, transparent 50%), radial-gradient(ellipse 600px 600px at 90% 10%, rgba(255,255,255,${0.15*dec}) 0%, transparent 40%), linear-gradient(${angle}deg, ${bg}, ${palette.bgBlack10})`,
+    'minimal': (dec, angle) => `linear-gradient(${angle}deg, ${bg}, ${palette.bgPrimary08})`,
+    'diagonal': (dec, angle) => `linear-gradient(135deg, ${bg} 45%, ${palette.primaryBg50} 45%, ${palette.primaryBg50} 55%, ${palette.bgAccent20} 55%)`,
+    'noise': (dec, angle) => `linear-gradient(${angle}deg, ${bg}, ${palette.bgPrimary20} 50%, ${palette.bgAccent15})`,
+    'waves': (dec, angle) => `linear-gradient(${angle}deg, ${bg}, ${palette.bgPrimary10})`,
+    'glass': (dec, angle) => `linear-gradient(${angle}deg, ${bg}, ${palette.bgPrimary15})`,
+    'dots': (dec, angle) => `linear-gradient(${angle}deg, ${bg}, ${palette.bgPrimary10})`,
+    'geometric': (dec, angle) => `linear-gradient(${angle}deg, ${bg}, ${palette.bgPrimary08})`
+};
+
+function getBgCss(effect, dec, angle) {
+    return (bgCss[effect] || bgCss['aurora'])(dec, angle);
+}
+
+function getExtraHtml(effect, dec) {
+    if (effect === 'noise') return '<svg width="0" height="0" style="position:absolute"><filter id="grain"><feTurbulence type="fractalNoise" baseFrequency="0.65" numOctaves="3" stitchTiles="stitch"/><feColorMatrix type="saturate" values="0"/></filter></svg><div style="position:absolute;inset:0;filter:url(#grain);opacity:'+0.12*dec+';mix-blend-mode:overlay;z-index:2"></div>';
+    if (effect === 'waves') return '<svg style="position:absolute;bottom:0;left:0;width:100%;height:100%;z-index:1" viewBox="0 0 1200 630" preserveAspectRatio="none"><path d="M0,500 C200,450 400,550 600,480 C800,410 1000,520 1200,470 L1200,630 L0,630 Z" fill="'+palette.primaryBg70+'" opacity="'+0.4*dec+'"/><path d="M0,530 C300,480 500,580 700,510 C900,440 1100,550 1200,500 L1200,630 L0,630 Z" fill="'+palette.accentBg80+'" opacity="'+0.3*dec+'"/><path d="M0,560 C250,520 450,600 650,550 C850,500 1050,580 1200,540 L1200,630 L0,630 Z" fill="'+brand.primary+'" opacity="'+0.2*dec+'"/></svg>';
+    if (effect === 'glass') return '<div style="position:absolute;border-radius:50%;background:linear-gradient(135deg,rgba('+ar+','+0.3*dec+'),rgba('+pr+','+0.1*dec+'));filter:blur(40px);z-index:1;width:400px;height:400px;top:-100px;right:-50px"></div><div style="position:absolute;border-radius:50%;background:linear-gradient(135deg,rgba('+pr+','+0.25*dec+'),rgba('+ar+','+0.1*dec+'));filter:blur(40px);z-index:1;width:300px;height:300px;bottom:-80px;left:-60px"></div><div style="position:absolute;border-radius:50%;background:rgba(255,255,255,'+0.1*dec+');filter:blur(60px);z-index:1;width:200px;height:200px;top:40%;left:30%"></div>';
+    if (effect === 'dots') return '<div style="position:absolute;inset:0;background-image:radial-gradient(circle,rgba('+pr+','+0.15*dec+') 1.5px,transparent 1.5px);background-size:24px 24px;z-index:1"></div>';
+    if (effect === 'geometric') return '<div style="position:absolute;inset:0;background-image:linear-gradient(0deg,'+palette.primaryBg90+' 1px,transparent 1px),linear-gradient(90deg,'+palette.primaryBg90+' 1px,transparent 1px);background-size:60px 60px;z-index:1;opacity:'+0.5*dec+'"></div>';
+    return '';
+}
+
+function genHtml(effect, dec, glow, depth, angle) {
+    const background = getBgCss(effect, dec, angle), extra = getExtraHtml(effect, dec);
+    const tagline = brand.tagline ? '<p style="color:'+palette.textAccent30+';font-size:26px;text-align:center;max-width:900px;opacity:0.85">'+brand.tagline+'</p>' : '';
+    return '<!DOCTYPE html><html><head><style>'+interFontCss+'*{margin:0;padding:0;box-sizing:border-box}body{width:1200px;height:630px;font-family:Inter,sans-serif;position:relative;overflow:hidden;background:'+background+'}.content{position:absolute;inset:0;display:flex;flex-direction:column;justify-content:center;align-items:center;padding:60px 80px;z-index:10}.brand-name{color:'+brand.text+';font-size:88px;font-weight:800;letter-spacing:-3px;text-align:center;text-shadow:0 0 60px rgba('+ar+','+0.4*glow+'),0 0 30px rgba('+ar+','+0.2*glow+'),0 4px 12px rgba(0,0,0,'+0.4*depth+')}.accent-line{width:120px;height:4px;margin:24px 0;background:linear-gradient(90deg,transparent,'+brand.accent+' 20%,'+brand.accent+' 80%,transparent);border-radius:2px}.accent-bar{position:absolute;bottom:0;left:0;right:0;height:6px;background:linear-gradient(90deg,'+brand.primary+','+brand.accent+','+brand.primary+')}</style></head><body>'+extra+'<div class="content"><h1 class="brand-name">'+brand.name+'</h1><div class="accent-line"></div>'+tagline+'</div><div class="accent-bar"></div></body></html>';
+}
+
+// Reassigning srcdoc reloads the whole iframe, so only do it when the page changes
+let lastSrcdoc = '';
+
+function update() {
+    const effect = document.getElementById('bg-effect').value;
+    const dec = parseFloat(document.getElementById('decoration').value);
+    const glow = parseFloat(document.getElementById('glow').value);
+    const depth = parseFloat(document.getElementById('depth').value);
+    const angle = parseInt(document.getElementById('gradient-angle').value);
+    document.getElementById('dec-val').textContent = dec.toFixed(1);
+    document.getElementById('glow-val').textContent = glow.toFixed(1);
+    document.getElementById('depth-val').textContent = depth.toFixed(1);
+    document.getElementById('angle-val').textContent = angle;
+    document.querySelectorAll('.effect-card').forEach(c => c.classList.toggle('active', c.dataset.effect === effect));
+    const srcdoc = genHtml(effect, dec, glow, depth, angle);
+    if (srcdoc !== lastSrcdoc) {
+        lastSrcdoc = srcdoc;
+        document.getElementById('og-preview').srcdoc = srcdoc;
+    }
+    let cmd = 'python brand_kit_gen.py ' + sourceUrl + ' --bg-effect ' + effect;
+    if (dec !== 1.0) cmd += ' --decoration ' + dec;
+    if (glow !== 1.0) cmd += ' --glow ' + glow;
+    if (depth !== 1.0) cmd += ' --depth ' + depth;
+    if (angle !== 160) cmd += ' --gradient-angle ' + angle;
+    document.getElementById('regen-cmd').textContent = cmd;
+}
+
+const grid = document.getElementById('effect-grid');
+for (const [e, d] of Object.entries(effects)) {
+    const card = document.createElement('div');
+    card.className = 'effect-card';
+    card.dataset.effect = e;
+    const h4 = document.createElement('h4');
+    h4.textContent = e;
+    const p = document.createElement('p');
+    p.textContent = d;
+    card.appendChild(h4);
+    card.appendChild(p);
+    card.onclick = () => { document.getElementById('bg-effect').value = e; update(); };
+    grid.appendChild(card);
+}
+
+// Dragging a slider fires input events far faster than the iframe can re-render
+let updateTimer;
+const debouncedUpdate = () => { clearTimeout(updateTimer); updateTimer = setTimeout(update, 30); };
+['bg-effect','decoration','glow','depth','gradient-angle'].forEach(id => document.getElementById(id).addEventListener('input', debouncedUpdate));
+document.getElementById('copy-btn').onclick = () => navigator.clipboard.writeText(document.getElementById('regen-cmd').textContent);
+update();
+'''
+
+# Encoded once for the preview's JS, like the labels below
+_EFFECTS_JSON = json.dumps(dict(BG_EFFECTS), separators=(',', ':'))
+
+# Escaped once: the effect list is fixed, only the selected option varies
+_EFFECT_OPTION_LABELS = tuple(
+    (effect, f'{escape(effect)} - {escape(desc)}') for effect, desc in BG_EFFECTS.items()
+)
+
+
+def write_if_changed(path: Path, text: str):
+    """Write text to path unless it already has exactly that content."""
+    try:
+        if path.read_text(encoding='utf-8') == text:
+            return
+    except OSError:
+        pass
+    path.write_text(text, encoding='utf-8')
+
+
+def generate_preview_html(output_dir: Path, brand: BrandIdentity, source_url: str, style: StyleConfig = None) -> Path:
+    """Generate HTML preview page showing all generated assets with live OG preview."""
+    # Build effect options HTML
+    effect_options = '\n'.join([
+        f'<option value="{effect}" {"selected" if style and style.bg_effect == effect else ""}>{label}</option>'
+        for effect, label in _EFFECT_OPTION_LABELS
+    ])
+
+    # Safely encode data for JS
+    brand_json = json.dumps({
+        'name': brand.name,
+        'primary': brand.primary_color,
+        'accent': brand.accent_color,
+        'background': brand.background_color,
+        'text': brand.text_color,
+        'tagline': brand.tagline or ''
+    }, separators=(',', ':'))
+    source_url_json = json.dumps(source_url)
+
+    fields = {
+        'name': escape(brand.name),
+        'primary': brand.primary_color,
+        'accent': brand.accent_color,
+        'background': brand.background_color,
+        'text': brand.text_color,
+        'theme': brand.theme,
+        'source_url': escape(source_url),
+        'effect_options': effect_options,
+        'decoration': style.decoration if style else 1.0,
+        'glow': style.glow if style else 1.0,
+        'depth': style.depth if style else 1.0,
+        'gradient_angle': style.gradient_angle if style else 160,
+        'brand_json': brand_json,
+        'effects_json': _EFFECTS_JSON,
+        'source_url_json': source_url_json,
+        **preview_asset_fields(),
+    }
+
+    # Write section by section rather than building the whole page in memory
     preview_path = output_dir / 'preview.html'
-    preview_path.write_text(html)
+    with preview_path.open('w', encoding='utf-8') as f:
+        for section in _PREVIEW_SECTIONS:
+            f.write(section.format_map(fields))
+
+    # Left untouched when unchanged, so browsers keep their cached copy
+    preview_js = f"const interFontCss = {json.dumps(fields['inter_font_css'])};\n\n{_PREVIEW_JS}"
+    write_if_changed(output_dir / 'preview.js', preview_js)
     return preview_path
 
 
-def main():
-    args = parse_args()
+def warm_up_browser():
+    """Launch this thread's Chromium ahead of rendering, if Playwright works here."""
+    if html_method_available():
+        from generators.browser_pool import get_browser
 
-    try:
-        # Extract brand identity
-        brand = extract_brand_identity(args.url, args, verbose=args.verbose)
+        get_browser()
 
-        # Determine generation method
-        method = args.method
-        if args.ai:
-            method = 'ai'
 
-        # Check if HTML/Playwright is available, fallback to PIL if not
-        if method == 'html' and not is_playwright_available():
+@dataclass
+class Assets:
+    """A generated brand kit, encoded in memory and not yet written."""
+    brand: BrandIdentity
+    style: Optional[StyleConfig]  # Set for the HTML method only
+    source_url: str
+    og_image: bytes               # PNG
+    favicons: Dict[str, bytes]    # filename -> contents
+
+
+def generate_assets(args, brand: BrandIdentity) -> Assets:
+    """Generate and encode the brand kit images for brand, writing nothing."""
+    # Determine generation method
+    method = args.method
+    if args.ai:
+        method = 'ai'
+
+    # Check if HTML/Playwright is available, fallback to PIL if not
+    if method == 'html':
+        if not html_method_available():
             if args.verbose:
                 print("\n⚠️  Playwright not available, falling back to PIL")
                 print("   To enable HTML mode: pip install playwright && playwright install chromium")
             method = 'pil'
 
-        # Build style config for HTML method
-        style = build_style_config(args) if method == 'html' else None
+    # Build style config for HTML method
+    style = build_style_config(args) if method == 'html' else None
 
-        # Generate images
-        if method == 'html':
-            logo, og_image = generate_with_html(brand, args)
-        elif method == 'ai':
-            logo, og_image = generate_with_ai(brand, args)
-        else:
-            logo, og_image = generate_with_pil(brand, args)
+    # Generate images
+    if method == 'html':
+        logo, og_image = generate_with_html(brand, args)
+    elif method == 'ai':
+        logo, og_image = generate_with_ai(brand, args)
+    else:
+        logo, og_image = generate_with_pil(brand, args)
 
-        # Build favicon set
-        if args.verbose:
-            print(f"\n📁 Building favicon set in {args.output}/...")
+    # Fast zlib level while iterating; full optimization on request
+    compress_level = None if args.optimize else 1
 
-        args.output.mkdir(parents=True, exist_ok=True)
+    # Encode the OG image in the background while favicons are encoded;
+    # the HTML method may have handed it over already encoded
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        og_future = None
+        if not isinstance(og_image, bytes):
+            og_future = executor.submit(encode_png, og_image, compress_level)
 
-        generated = build_favicon_set(
+        favicons = encode_favicon_set(
             source=logo,
-            output_dir=args.output,
             theme_color=brand.primary_color,
-            verbose=args.verbose
+            png_compress_level=compress_level
         )
+        og_png = og_image if og_future is None else og_future.result()
 
-        # Save OG image
-        og_path = args.output / 'og-image.png'
-        og_image.save(og_path, 'PNG', optimize=True)
-        if args.verbose:
-            print(f"  Created og-image.png (1200x630)")
+    return Assets(brand=brand, style=style, source_url=args.url, og_image=og_png, favicons=favicons)
 
-        # Generate HTML preview with style info for live preview
-        preview_path = generate_preview_html(args.output, brand, args.url, style)
-        if args.verbose:
-            print(f"  Created preview.html")
-
-        # Summary
-        print(f"\n✅ Brand kit generated successfully!")
-        print(f"   Output: {args.output.absolute()}")
-        print(f"   Files: {len(generated) + 2} total")
-        print(f"\n   Colors used:")
-        print(f"     Primary:    {brand.primary_color}")
-        print(f"     Accent:     {brand.accent_color}")
-        print(f"     Background: {brand.background_color}")
-        print(f"\n   📄 Preview: file://{preview_path.absolute()}")
+
+def write_assets(assets: Assets, output_dir: Path, verbose: bool = False) -> dict:
+    """Write a generated brand kit to output_dir.
+
+    Returns a JSON-serializable summary (see print_summary).
+    """
+    brand = assets.brand
+    if verbose:
+        print(f"\n📁 Writing brand kit to {output_dir}/...")
+
+    # Only created once everything rendered, so a failed run leaves no
+    # half-populated directory behind
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    generated = write_favicon_set(assets.favicons, output_dir, verbose=verbose)
+    (output_dir / 'og-image.png').write_bytes(assets.og_image)
+    if verbose:
+        print(f"  Created og-image.png (1200x630)")
+
+    # Generate HTML preview with style info for live preview
+    preview_path = generate_preview_html(output_dir, brand, assets.source_url, assets.style)
+    if verbose:
+        print(f"  Created preview.html, preview.js")
+
+    return {
+        'output': str(output_dir.absolute()),
+        'files': len(generated) + 3,
+        'primary': brand.primary_color,
+        'accent': brand.accent_color,
+        'background': brand.background_color,
+        'preview': str(preview_path.absolute()),
+    }
+
+
+def run_job(args) -> dict:
+    """Generate a brand kit for args.url into args.output.
+
+    Returns a JSON-serializable summary (see print_summary).
+    """
+    if args.method == 'html' and not args.ai:
+        # Launch Chromium while the site is scraped. Sync Playwright only
+        # works on the thread that started it, so this thread launches the
+        # browser it will render with and extraction moves to a worker.
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            brand_future = executor.submit(extract_brand_identity, args.url, args, args.verbose)
+            warm_up_browser()
+            brand = brand_future.result()
+    else:
+        brand = extract_brand_identity(args.url, args, verbose=args.verbose)
+
+    assets = generate_assets(args, brand)
+    return write_assets(assets, args.output, verbose=args.verbose)
+
+
+def print_summary(result: dict):
+    """Print the summary of a finished run_job."""
+    print(f"\n✅ Brand kit generated successfully!")
+    print(f"   Output: {result['output']}")
+    print(f"   Files: {result['files']} total")
+    print(f"\n   Colors used:")
+    print(f"     Primary:    {result['primary']}")
+    print(f"     Accent:     {result['accent']}")
+    print(f"     Background: {result['background']}")
+    print(f"\n   📄 Preview: file://{result['preview']}")
+
+
+def try_run_job(args) -> dict:
+    """run_job, reporting failure as {'ok': False, 'error': ...} instead of raising."""
+    try:
+        return {'ok': True, **run_job(args)}
+    except Exception as e:
+        return {'ok': False, 'error': str(e)}
+
+
+_UNSAFE_DIRNAME_RE = re.compile(r'[^a-z0-9]+')
+
+
+def read_batch_file(path: Path) -> List[str]:
+    """Read URLs from a --batch file, skipping blank lines, # comments and repeats."""
+    urls = []
+    for line in path.read_text(encoding='utf-8').splitlines():
+        line = line.strip()
+        if line and not line.startswith('#'):
+            urls.append(line)
+    return list(dict.fromkeys(urls))
+
+
+def batch_output_dirs(output: Path, urls: List[str]) -> List[Path]:
+    """Get the subdirectory of output that each URL's kit is written to.
+
+    Named after host and path. URLs that only differ in scheme or query
+    would share a name, so later ones get a -2, -3, ... suffix; batch jobs
+    run concurrently and must never write to the same directory.
+    """
+    used = set()
+    dirs = []
+    for url in urls:
+        parsed = urlparse(url)
+        slug = _UNSAFE_DIRNAME_RE.sub('-', f"{parsed.netloc}{parsed.path}".lower()).strip('-') or 'site'
+        name, n = slug, 1
+        while name in used:
+            n += 1
+            name = f"{slug}-{n}"
+        used.add(name)
+        dirs.append(output / name)
+    return dirs
+
+
+def run_batch(args) -> int:
+    """Generate a kit for every URL in args.batch; returns how many failed.
+
+    Sites are scraped and rendered concurrently on a bounded pool. Like
+    the daemon, each worker keeps its own browser across its jobs.
+    """
+    urls = read_batch_file(args.batch)
+    jobs = [
+        argparse.Namespace(**{**vars(args), 'url': url, 'output': output})
+        for url, output in zip(urls, batch_output_dirs(args.output, urls))
+    ]
+
+    from generators.browser_pool import close_pool_browsers
+
+    workers = min(4, os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        try:
+            results = list(executor.map(try_run_job, jobs))
+        finally:
+            close_pool_browsers(executor, workers)
+
+    failed = 0
+    for url, result in zip(urls, results):
+        if result['ok']:
+            print_summary(result)
+        else:
+            failed += 1
+            print(f"\n❌ {url}: {result['error']}", file=sys.stderr)
+
+    print(f"\n📦 {len(urls) - failed}/{len(urls)} brand kits generated")
+    return failed
+
+
+def _run_daemon_job(job: dict) -> dict:
+    """Run one --client job inside the daemon."""
+    try:
+        args = parse_args(job['argv'])
+    except SystemExit:
+        return {'ok': False, 'error': 'invalid arguments: ' + ' '.join(job['argv'])}
+
+    # Relative paths are relative to the client, not the daemon
+    if not args.output.is_absolute():
+        args.output = Path(job['cwd']) / args.output
+
+    return try_run_job(args)
+
+
+def serve(socket_path: str):
+    """Run jobs sent by --client until interrupted.
+
+    The worker threads keep their Playwright browsers between jobs, so
+    only the first job per worker pays for launching Chromium.
+    Protocol: one JSON line per connection each way.
+    """
+    import signal
+    import socket
+    import socketserver
+
+    from generators.browser_pool import close_pool_browsers
+
+    # Clear a stale socket left by a daemon that didn't shut down cleanly,
+    # but never take over the socket of one that is still running
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(socket_path)
+        except FileNotFoundError:
+            pass
+        except ConnectionRefusedError:
+            os.unlink(socket_path)
+        else:
+            raise RuntimeError(f"A daemon is already listening on {socket_path}")
+
+    # Bounded: every worker may hold its own Chromium
+    workers = min(4, os.cpu_count() or 1)
+    executor = ThreadPoolExecutor(max_workers=workers)
+
+    class JobHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            line = self.rfile.readline()
+            if not line:
+                # A connect-only probe from another serve()
+                return
+            try:
+                job = json.loads(line)
+                result = executor.submit(_run_daemon_job, job).result()
+            except (ValueError, KeyError) as e:
+                result = {'ok': False, 'error': f'bad request: {e}'}
+            self.wfile.write(json.dumps(result).encode() + b'\n')
+
+    # Shut down the same way on `kill` as on Ctrl+C
+    def _stop(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, _stop)
+
+    with socketserver.ThreadingUnixStreamServer(socket_path, JobHandler) as server:
+        print(f"🛰️  Serving brand kit jobs on {socket_path} (Ctrl+C to stop)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            # A second SIGTERM must not interrupt the cleanup
+            signal.signal(signal.SIGTERM, signal.SIG_IGN)
+            close_pool_browsers(executor, workers)
+            executor.shutdown(wait=True)
+            os.unlink(socket_path)
+
+
+def send_job(socket_path: str, argv: list) -> dict:
+    """Send a job to a running --serve daemon and wait for its result."""
+    import socket
+
+    job = {'argv': argv, 'cwd': os.getcwd()}
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(socket_path)
+        except OSError:
+            raise RuntimeError(f"No daemon listening on {socket_path} (start one with --serve)")
+        sock.sendall(json.dumps(job).encode() + b'\n')
+        response = sock.makefile('rb').readline()
+    return json.loads(response)
+
+
+def main():
+    args = parse_args()
+
+    try:
+        if args.serve:
+            serve(args.socket)
+            return
+
+        if args.batch:
+            if run_batch(args):
+                sys.exit(1)
+            return
+
+        if args.client:
+            result = send_job(args.socket, sys.argv[1:])
+            if not result['ok']:
+                raise RuntimeError(result['error'])
+        else:
+            if args.method == 'html' and not args.ai:
+                from generators.browser_pool import close_browser
+
+                # The Playwright browser is shared across renders; shut it down on exit
+                atexit.register(close_browser)
+
+            result = run_job(args)
+
+        print_summary(result)
 
     except KeyboardInterrupt:
         print("\n\nCancelled.")
@@ -0,0 +1,10 @@
+"""Extractors for brand colors and metadata from websites."""
+
+# BeautifulSoup parser: lxml's C parser is several times faster than the
+# pure-Python html.parser, which stays as the fallback when it's missing
+HTML_PARSER = 'html.parser'
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    pass
@@ -1,21 +1,50 @@
 """Extract brand name and metadata from website."""
 import re
-from typing import Optional, Tuple
+from html import unescape
+from typing import Dict, Optional, Tuple
 from urllib.parse import urlparse
 
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Tag
+
+from extractors import HTML_PARSER
+from utils.http import SESSION, fetch_text
 
 
 class BrandExtractor:
     """Extract brand name, font, and other metadata from a website."""
 
-    def __init__(self, timeout: int = 10):
+    # Font-family patterns (run over every <style> tag on a page)
+    FONT_INLINE_PATTERN = re.compile(r'font-family:\s*([^;]+)', re.IGNORECASE)
+    FONT_BODY_PATTERN = re.compile(r'(?:body|html)\s*\{[^}]*font-family:\s*([^;]+)', re.IGNORECASE | re.DOTALL)
+    FONT_VAR_PATTERN = re.compile(r'--font-(?:family|primary|main):\s*([^;]+)', re.IGNORECASE)
+
+    # Title separators, in order of preference
+    TITLE_SEPARATORS = (' | ', ' - ', ' — ', ' :: ', ' : ')
+
+    # Title parts starting with these are unlikely to be the brand name
+    GENERIC_STARTERS = ('home', 'welcome', 'the', 'official', 'my')
+
+    # Fast path: name and tagline live in <head>, so only this much of the
+    # page is scanned for them, with comments and scripts dropped first
+    FAST_HEAD_CHARS = 64 * 1024
+    HEAD_NOISE_PATTERN = re.compile(r'<!--.*?-->|<script\b[^>]*>.*?</script\s*>', re.I | re.S)
+    META_TAG_PATTERN = re.compile(r'<meta\b([^>]*)>', re.I)
+    ATTR_PATTERN = re.compile(r'([\w:-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s"\'>]+))')
+    TITLE_PATTERN = re.compile(r'<title\b[^>]*>([^<]*)</title\s*>', re.I)
+    # Font sources, read from the whole page
+    BODY_TAG_PATTERN = re.compile(r'<body\b([^>]*)>', re.I)
+    STYLE_TAG_PATTERN = re.compile(r'<style\b[^>]*>(.*?)</style\s*>', re.I | re.S)
+
+    def __init__(
+        self,
+        timeout: int = 10,
+        session: Optional[requests.Session] = None,
+        fast_mode: bool = True,
+    ):
         self.timeout = timeout
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (compatible; BrandKitGen/1.0)'
-        })
+        self.session = session or SESSION
+        self.fast_mode = fast_mode
 
     def extract_from_url(self, url: str) -> dict:
         """Extract brand info from URL.
@@ -31,9 +60,7 @@ class BrandExtractor:
         domain = parsed.netloc.replace('www.', '')
 
         try:
-            response = self.session.get(url, timeout=self.timeout)
-            response.raise_for_status()
-            html = response.text
+            html = fetch_text(url, self.timeout, self.session)
         except requests.RequestException as e:
             # Fallback to domain-based name
             name = self._domain_to_name(domain)
@@ -45,11 +72,26 @@ class BrandExtractor:
                 'error': str(e)
             }
 
-        soup = BeautifulSoup(html, 'html.parser')
+        return self.extract_from_html(html, url)
+
+    def extract_from_html(self, html: str, url: str) -> dict:
+        """Extract brand info from an already-fetched page at url.
+
+        Returns the same dict as extract_from_url.
+        """
+        domain = urlparse(url).netloc.replace('www.', '')
+
+        if self.fast_mode:
+            result = self._extract_fast(html, domain)
+            if result is not None:
+                return result
+
+        soup = BeautifulSoup(html, HTML_PARSER)
+        meta = self._index_meta(soup)
 
-        name = self._extract_name(soup, domain)
-        tagline = self._extract_tagline(soup)
-        font_family = self._extract_font(soup)
+        name = self._extract_name(soup, meta, domain)
+        tagline = self._extract_tagline(meta)
+        font_family = self._extract_font(html)
 
         return {
             'name': name,
@@ -58,7 +100,65 @@ class BrandExtractor:
             'font_family': font_family
         }
 
-    def _extract_name(self, soup: BeautifulSoup, domain: str) -> str:
+    def _extract_fast(self, html: str, domain: str) -> Optional[dict]:
+        """Read name, tagline and font with regexes, without building a tree.
+
+        Returns None when the page has neither og:site_name nor a usable
+        <title> in its head; the caller then falls back to BeautifulSoup.
+        """
+        head = self.HEAD_NOISE_PATTERN.sub('', html[:self.FAST_HEAD_CHARS])
+
+        meta = {}
+        for attrs_text in self.META_TAG_PATTERN.findall(head):
+            attrs = {
+                attr.lower(): unescape(double or single or bare)
+                for attr, double, single, bare in self.ATTR_PATTERN.findall(attrs_text)
+            }
+            for attr in ('property', 'name'):
+                if attr in attrs:
+                    meta.setdefault((attr, attrs[attr]), attrs)
+
+        name = None
+        og_site = meta.get(('property', 'og:site_name'))
+        if og_site and og_site.get('content'):
+            name = og_site['content'].strip()
+        else:
+            title = self.TITLE_PATTERN.search(head)
+            if title and title.group(1):
+                name = self._clean_title(unescape(title.group(1)))
+        if not name:
+            return None
+
+        tagline = None
+        for key in (('property', 'og:description'), ('name', 'description')):
+            tag = meta.get(key)
+            if tag and tag.get('content'):
+                desc = tag['content'].strip()
+                if len(desc) < 200:
+                    tagline = desc
+                    break
+
+        return {
+            'name': name,
+            'domain': domain,
+            'tagline': tagline,
+            'font_family': self._extract_font(html)
+        }
+
+    def _index_meta(self, soup: BeautifulSoup) -> Dict[Tuple[str, str], Tag]:
+        """Map (attribute, value) to the first <meta> tag with it, in one pass.
+
+        Keyed on both `property` and `name`, e.g. ('property', 'og:site_name').
+        """
+        meta = {}
+        for tag in soup.find_all('meta'):
+            for attr in ('property', 'name'):
+                value = tag.get(attr)
+                if isinstance(value, str):
+                    meta.setdefault((attr, value), tag)
+        return meta
+
+    def _extract_name(self, soup: BeautifulSoup, meta: Dict[Tuple[str, str], Tag], domain: str) -> str:
         """Extract brand name from various sources."""
         # Priority order:
         # 1. og:site_name
@@ -67,7 +167,7 @@ class BrandExtractor:
         # 4. Domain name
 
         # Check og:site_name
-        og_site = soup.find('meta', property='og:site_name')
+        og_site = meta.get(('property', 'og:site_name'))
         if og_site and og_site.get('content'):
             return og_site['content'].strip()
 
@@ -99,10 +199,9 @@ class BrandExtractor:
         title = title.strip()
 
         # Split by common separators
-        separators = [' | ', ' - ', ' — ', ' :: ', ' : ']
         parts = [title]
 
-        for sep in separators:
+        for sep in self.TITLE_SEPARATORS:
             if sep in title:
                 parts = title.split(sep)
                 break
@@ -114,9 +213,8 @@ class BrandExtractor:
             return title
 
         # Prefer parts that don't start with common generic words
-        generic_starters = ['home', 'welcome', 'the', 'official', 'my']
         for part in candidates:
-            if not any(part.lower().startswith(g) for g in generic_starters):
+            if not part.lower().startswith(self.GENERIC_STARTERS):
                 return part
 
         return candidates[0]
@@ -146,17 +244,17 @@ class BrandExtractor:
 
         return name.capitalize()
 
-    def _extract_tagline(self, soup: BeautifulSoup) -> Optional[str]:
+    def _extract_tagline(self, meta: Dict[Tuple[str, str], Tag]) -> Optional[str]:
         """Extract tagline from meta description or og:description."""
         # Try og:description first
-        og_desc = soup.find('meta', property='og:description')
+        og_desc = meta.get(('property', 'og:description'))
         if og_desc and og_desc.get('content'):
             desc = og_desc['content'].strip()
             if len(desc) < 200:
                 return desc
 
         # Try meta description
-        meta_desc = soup.find('meta', attrs={'name': 'description'})
+        meta_desc = meta.get(('name', 'description'))
         if meta_desc and meta_desc.get('content'):
             desc = meta_desc['content'].strip()
             if len(desc) < 200:
@@ -164,49 +262,58 @@ class BrandExtractor:
 
         return None
 
-    def _extract_font(self, soup: BeautifulSoup) -> Optional[str]:
-        """Extract primary font family from CSS."""
+    def _extract_font(self, html: str) -> Optional[str]:
+        """Extract primary font family from CSS.
+
+        Reads the raw page source; the <body> style and <style> blocks are
+        plain text there, so there is no need to look them up in the tree.
+        """
         # Check inline styles on body
-        body = soup.find('body')
-        if body and body.get('style'):
-            font = self._parse_font_from_style(body['style'])
-            if font:
-                return font
+        body = self.BODY_TAG_PATTERN.search(html)
+        if body:
+            for attr, double, single, bare in self.ATTR_PATTERN.findall(body.group(1)):
+                if attr.lower() == 'style':
+                    font = self._parse_font_from_style(unescape(double or single or bare))
+                    if font:
+                        return font
+                    break
 
         # Check style tags for body/html font-family
-        for style in soup.find_all('style'):
-            if style.string:
-                font = self._parse_font_from_css(style.string)
-                if font:
-                    return font
+        for css in self.STYLE_TAG_PATTERN.findall(html):
+            font = self._parse_font_from_css(css)
+            if font:
+                return font
 
         return None
 
     def _parse_font_from_style(self, style: str) -> Optional[str]:
         """Parse font-family from inline style."""
-        match = re.search(r'font-family:\s*([^;]+)', style, re.IGNORECASE)
+        match = self.FONT_INLINE_PATTERN.search(style)
         if match:
-            return match.group(1).strip().strip('"\'')
+            return self._clean_font_value(match.group(1))
         return None
 
     def _parse_font_from_css(self, css: str) -> Optional[str]:
         """Parse font-family from CSS targeting body/html."""
         # Look for body { ... font-family: ... }
-        body_match = re.search(
-            r'(?:body|html)\s*\{[^}]*font-family:\s*([^;]+)',
-            css,
-            re.IGNORECASE | re.DOTALL
-        )
+        body_match = self.FONT_BODY_PATTERN.search(css)
         if body_match:
-            return body_match.group(1).strip().strip('"\'')
+            return self._clean_font_value(body_match.group(1))
 
         # Look for :root CSS variable
-        root_match = re.search(
-            r'--font-(?:family|primary|main):\s*([^;]+)',
-            css,
-            re.IGNORECASE
-        )
+        root_match = self.FONT_VAR_PATTERN.search(css)
         if root_match:
-            return root_match.group(1).strip().strip('"\'')
+            return self._clean_font_value(root_match.group(1))
 
         return None
+
+    def _clean_font_value(self, value: str) -> str:
+        """Unquote a single font name; leave a font stack as written.
+
+        Stripping quotes off a whole stack would break it:
+        "'Poppins', sans-serif" -> "Poppins', sans-serif".
+        """
+        value = value.strip()
+        if ',' in value:
+            return value
+        return value.strip('"\'')
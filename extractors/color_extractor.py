@@ -1,14 +1,16 @@
 """Extract color palette from website CSS/HTML."""
 import re
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from html import unescape
 from typing import List, Dict, Tuple, Optional
 from urllib.parse import urljoin
 
 import requests
 from bs4 import BeautifulSoup
 
-import sys
-sys.path.insert(0, str(__file__).rsplit('/', 2)[0])
+from extractors import HTML_PARSER
+from utils.http import SESSION, fetch_text
 from utils.color_utils import (
     normalize_color, luminance, saturation, is_grayscale, color_distance
 )
@@ -22,19 +24,37 @@ class ColorExtractor:
     RGB_PATTERN = re.compile(r'rgba?\s*\(\s*\d+\s*,\s*\d+\s*,\s*\d+[^)]*\)')
     CSS_VAR_PATTERN = re.compile(r'--[\w-]+:\s*([#\w(),.%\s]+);')
 
-    # Semantic CSS variable patterns (prioritized)
-    SEMANTIC_VAR_PATTERNS = {
-        'primary': re.compile(r'--(color-)?primary[^:]*:\s*(#[0-9a-fA-F]{3,6})', re.I),
-        'accent': re.compile(r'--(color-)?(accent|secondary|highlight)[^:]*:\s*(#[0-9a-fA-F]{3,6})', re.I),
-        'background': re.compile(r'--(color-)?(background|bg)[^:]*:\s*(#[0-9a-fA-F]{3,6})', re.I),
+    # Inline CSS, read straight from the page source (cheaper than walking the tree)
+    STYLE_TAG_PATTERN = re.compile(r'<style\b[^>]*>(.*?)</style\s*>', re.I | re.S)
+    STYLE_ATTR_PATTERN = re.compile(r'<[^>]*?\sstyle\s*=\s*(?:"([^"]*)"|\'([^\']*)\')', re.I)
+
+    # Semantic CSS variables, all roles in one pattern so the CSS is scanned
+    # once. Wrapped in a lookahead so a match doesn't consume text: `[^:]*`
+    # can run past the next `--bg` and that variable must still be seen.
+    SEMANTIC_VAR_PATTERN = re.compile(
+        r'(?=--(?:color-)?(?P<key>primary|accent|secondary|highlight|background|bg)'
+        r'[^:]*:\s*(?P<hex>#[0-9a-fA-F]{3,6}))',
+        re.I
+    )
+    SEMANTIC_VAR_ROLES = {
+        'primary': 'primary',
+        'accent': 'accent',
+        'secondary': 'accent',
+        'highlight': 'accent',
+        'background': 'background',
+        'bg': 'background',
     }
 
-    def __init__(self, timeout: int = 10):
+    # Size limits on the CSS we scan. Everything downstream runs several
+    # regex passes over the collected text, so it is capped here; patterns
+    # added later can rely on this bound but should still avoid unbounded
+    # backtracking like nested `.*` / `[^}]*` runs.
+    MAX_CSS_CHARS = 512 * 1024
+    MAX_STYLESHEET_BYTES = 256 * 1024
+
+    def __init__(self, timeout: int = 10, session: Optional[requests.Session] = None):
         self.timeout = timeout
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (compatible; BrandKitGen/1.0)'
-        })
+        self.session = session or SESSION
 
     def extract_from_url(self, url: str) -> Dict[str, any]:
         """Extract all colors from a URL.
@@ -49,30 +69,34 @@ class ColorExtractor:
                 - theme: 'dark' or 'light'
         """
         try:
-            response = self.session.get(url, timeout=self.timeout)
-            response.raise_for_status()
-            html = response.text
+            html = fetch_text(url, self.timeout, self.session)
         except requests.RequestException as e:
             return {'error': str(e), 'colors': [], 'theme': 'light'}
 
-        soup = BeautifulSoup(html, 'html.parser')
+        return self.extract_from_html(html, url)
+
+    def extract_from_html(self, html: str, base_url: str) -> Dict[str, any]:
+        """Extract all colors from an already-fetched page.
+
+        Linked stylesheets are still fetched, resolved against base_url.
+        Returns the same dict as extract_from_url.
+        """
+        soup = BeautifulSoup(html, HTML_PARSER)
 
         # Collect all CSS
-        all_css = self._collect_css(soup, url)
+        all_css = self._collect_css(html, soup, base_url)
 
         # FIRST: Try to extract semantic CSS variables (highest priority)
         semantic_colors = self._extract_semantic_vars(all_css)
 
-        # Extract all colors from CSS
-        colors = self._extract_colors(all_css)
+        # Extract and count all colors from CSS
+        color_counts = self._count_colors(all_css)
 
         # Also check meta theme-color
         theme_color = self._get_meta_theme_color(soup)
         if theme_color:
-            colors.append(theme_color)
+            color_counts[theme_color] += 1
 
-        # Count and deduplicate
-        color_counts = Counter(colors)
         unique_colors = list(color_counts.keys())
 
         # Classify colors (fallback if no semantic vars)
@@ -96,32 +120,56 @@ class ColorExtractor:
             **classified
         }
 
-    def _collect_css(self, soup: BeautifulSoup, base_url: str) -> str:
+    def _collect_css(self, html: str, soup: BeautifulSoup, base_url: str) -> str:
         """Collect all CSS from inline styles and linked stylesheets."""
-        css_parts = []
-
         # Inline <style> tags
-        for style_tag in soup.find_all('style'):
-            if style_tag.string:
-                css_parts.append(style_tag.string)
+        css_parts = [css for css in self.STYLE_TAG_PATTERN.findall(html) if css]
 
         # Inline style attributes
-        for elem in soup.find_all(style=True):
-            css_parts.append(elem['style'])
+        for double_quoted, single_quoted in self.STYLE_ATTR_PATTERN.findall(html):
+            css_parts.append(unescape(double_quoted or single_quoted))
 
         # Linked stylesheets (first 3 to avoid too many requests)
-        for link in soup.find_all('link', rel='stylesheet')[:3]:
-            href = link.get('href')
-            if href:
-                css_url = urljoin(base_url, href)
-                try:
-                    css_response = self.session.get(css_url, timeout=self.timeout)
-                    if css_response.status_code == 200:
-                        css_parts.append(css_response.text)
-                except requests.RequestException:
-                    pass  # Skip failed stylesheet fetches
-
-        return '\n'.join(css_parts)
+        css_urls = [
+            urljoin(base_url, link['href'])
+            for link in soup.find_all('link', rel='stylesheet')[:3]
+            if link.get('href')
+        ]
+        if css_urls:
+            # Fetched concurrently but kept in document order, since the
+            # first matching semantic variable wins
+            with ThreadPoolExecutor(max_workers=len(css_urls)) as executor:
+                for css in executor.map(self._fetch_css, css_urls):
+                    if css is not None:
+                        css_parts.append(css)
+
+        return '\n'.join(css_parts)[:self.MAX_CSS_CHARS]
+
+    def _fetch_css(self, css_url: str) -> Optional[str]:
+        """Fetch a linked stylesheet; None if it can't be loaded or is too big."""
+        limit = self.MAX_STYLESHEET_BYTES
+        try:
+            with self.session.get(css_url, timeout=self.timeout, stream=True) as css_response:
+                if css_response.status_code != 200:
+                    return None
+                declared = css_response.headers.get('Content-Length', '')
+                if declared.isdigit() and int(declared) > limit:
+                    return None
+
+                # Content-Length can be missing or wrong, so stop reading
+                # as soon as the body goes over the limit
+                body = bytearray()
+                for chunk in css_response.iter_content(chunk_size=64 * 1024):
+                    body += chunk
+                    if len(body) > limit:
+                        return None
+                encoding = css_response.encoding or 'utf-8'
+        except requests.RequestException:
+            return None  # Skip failed stylesheet fetches
+        try:
+            return bytes(body).decode(encoding, errors='replace')
+        except LookupError:
+            return bytes(body).decode('utf-8', errors='replace')  # Bogus charset
 
     def _extract_semantic_vars(self, css: str) -> Dict[str, Optional[str]]:
         """Extract colors from semantic CSS variable names.
@@ -133,42 +181,46 @@ class ColorExtractor:
         - --background-color: #xxx
         """
         result = {}
-
-        for key, pattern in self.SEMANTIC_VAR_PATTERNS.items():
-            match = pattern.search(css)
-            if match:
-                # Get the last group (the hex color)
-                hex_color = match.group(match.lastindex)
-                normalized = normalize_color(hex_color)
-                if normalized:
-                    result[key] = normalized
+        seen = set()
+
+        # The first variable for each role wins
+        for match in self.SEMANTIC_VAR_PATTERN.finditer(css):
+            role = self.SEMANTIC_VAR_ROLES[match.group('key').lower()]
+            if role in seen:
+                continue
+            seen.add(role)
+            normalized = normalize_color(match.group('hex'))
+            if normalized:
+                result[role] = normalized
+            if len(seen) == 3:
+                break
 
         return result
 
-    def _extract_colors(self, css: str) -> List[str]:
-        """Extract all color values from CSS text."""
-        colors = []
-
-        # Extract hex colors
-        for match in self.HEX_PATTERN.findall(css):
-            normalized = normalize_color(f'#{match}')
-            if normalized:
-                colors.append(normalized)
-
-        # Extract rgb/rgba colors
-        for match in self.RGB_PATTERN.findall(css):
-            normalized = normalize_color(match)
-            if normalized:
-                colors.append(normalized)
+    def _count_colors(self, css: str) -> Counter:
+        """Count all color values in CSS text, in order of first appearance.
 
-        # Extract CSS variable values
-        for match in self.CSS_VAR_PATTERN.findall(css):
-            value = match.strip()
-            normalized = normalize_color(value)
-            if normalized:
-                colors.append(normalized)
+        A page repeats the same few colors many times, so each distinct
+        token is normalized once and counted by its number of matches.
+        """
+        color_counts = Counter()
+
+        # Hex colors, then rgb/rgba colors, then CSS variable values.
+        # Kept as separate findall passes on purpose: each pattern starts
+        # with a literal the regex engine can skip ahead to, and the passes
+        # overlap (a hex value inside a variable counts for both), so one
+        # fused alternation would be both slower and wrong.
+        for matches, prefix in (
+            (self.HEX_PATTERN.findall(css), '#'),
+            (self.RGB_PATTERN.findall(css), ''),
+            (self.CSS_VAR_PATTERN.findall(css), ''),
+        ):
+            for token, count in Counter(matches).items():
+                normalized = normalize_color(prefix + token)
+                if normalized:
+                    color_counts[normalized] += count
 
-        return colors
+        return color_counts
 
     def _get_meta_theme_color(self, soup: BeautifulSoup) -> Optional[str]:
         """Extract theme-color from meta tag."""
@@ -197,12 +249,15 @@ class ColorExtractor:
                 'theme': 'light'
             }
 
+        # Score each color once; the passes below only look scores up
+        lum = {c: luminance(c) for c in colors}
+
         # Sort by luminance
-        sorted_by_lum = sorted(colors, key=luminance)
+        sorted_by_lum = sorted(colors, key=lum.__getitem__)
 
         # Find very dark colors (potential backgrounds for dark theme)
-        dark_colors = [c for c in colors if luminance(c) < 0.1]
-        light_colors = [c for c in colors if luminance(c) > 0.9]
+        dark_colors = [c for c in colors if lum[c] < 0.1]
+        light_colors = [c for c in colors if lum[c] > 0.9]
 
         # Determine theme based on darkest colors prevalence
         dark_count = sum(counts.get(c, 0) for c in dark_colors)
@@ -212,9 +267,9 @@ class ColorExtractor:
 
         # Background color
         if is_dark_theme and dark_colors:
-            background = min(dark_colors, key=luminance)
+            background = min(dark_colors, key=lum.__getitem__)
         elif light_colors:
-            background = max(light_colors, key=luminance)
+            background = max(light_colors, key=lum.__getitem__)
         else:
             background = sorted_by_lum[-1] if is_dark_theme else sorted_by_lum[0]
 
@@ -2,15 +2,14 @@
 import io
 import os
 from abc import ABC, abstractmethod
-from typing import Optional
+from functools import lru_cache
+from typing import Optional, Tuple
 from urllib.parse import quote
 
-import requests
 from PIL import Image
 
-import sys
-sys.path.insert(0, str(__file__).rsplit('/', 2)[0])
 from models.brand_identity import BrandIdentity
+from utils.http import SESSION
 
 
 class AIProvider(ABC):
@@ -59,7 +58,7 @@ class PollinationsProvider(AIProvider):
         # Build URL with parameters
         url = f"{self.BASE_URL}/{encoded_prompt}?width={width}&height={height}&model=flux&nologo=true"
 
-        response = requests.get(url, timeout=self.timeout)
+        response = SESSION.get(url, timeout=self.timeout)
         response.raise_for_status()
 
         return Image.open(io.BytesIO(response.content))
@@ -89,7 +88,7 @@ class OpenAIProvider(AIProvider):
         # Map dimensions to supported sizes
         size = self._get_supported_size(width, height)
 
-        response = requests.post(
+        response = SESSION.post(
             "https://api.openai.com/v1/images/generations",
             headers={
                 "Authorization": f"Bearer {self.api_key}",
@@ -145,20 +144,32 @@ class GeminiProvider(AIProvider):
 
     def __init__(self):
         self.api_key = os.environ.get('GEMINI_API_KEY') or os.environ.get('GOOGLE_API_KEY')
+        self._client = None
+        self._types = None
 
     def is_available(self) -> bool:
         return bool(self.api_key)
 
+    def _get_client(self):
+        """Import google-genai and build the client on first use, then reuse it.
+
+        The import stays lazy: it is slow, and only this provider needs it.
+        """
+        if self._client is None:
+            from google import genai
+            from google.genai import types
+
+            self._client = genai.Client(api_key=self.api_key)
+            self._types = types
+        return self._client, self._types
+
     def generate(self, prompt: str, width: int, height: int) -> Image.Image:
         """Generate image via Gemini API using generate_content with IMAGE modality."""
         if not self.is_available():
             raise RuntimeError("GEMINI_API_KEY not set")
 
         try:
-            from google import genai
-            from google.genai import types
-
-            client = genai.Client(api_key=self.api_key)
+            client, types = self._get_client()
 
             last_error = None
             for model in self.MODELS:
@@ -221,6 +232,7 @@ class AIGenerator:
         """
         self.brand = brand
         self.requested_provider = provider
+        self._provider: Optional[AIProvider] = None
 
     def generate_logo(self, size: int = 512) -> Image.Image:
         """Generate logo using AI.
@@ -268,25 +280,28 @@ class AIGenerator:
         return img
 
     def _get_provider(self) -> AIProvider:
-        """Get the best available provider."""
+        """Get the best available provider (resolved once, then reused)."""
+        if self._provider is None:
+            self._provider = self._resolve_provider()
+        return self._provider
+
+    def _resolve_provider(self) -> AIProvider:
+        """Pick the requested provider, or the first available one."""
+        available = _available_providers()
+
         if self.requested_provider:
             if self.requested_provider not in self.PROVIDERS:
                 raise ValueError(f"Unknown provider: {self.requested_provider}")
 
-            provider_class = self.PROVIDERS[self.requested_provider]
-            provider = provider_class()
-
-            if not provider.is_available():
-                raise RuntimeError(f"Provider {self.requested_provider} is not available")
+            for name, provider in available:
+                if name == self.requested_provider:
+                    return provider
 
-            return provider
+            raise RuntimeError(f"Provider {self.requested_provider} is not available")
 
-        # Auto-detect: prefer quality first (OpenAI), then free (Pollinations), then Gemini
-        for name in ['openai', 'pollinations', 'gemini']:
-            provider_class = self.PROVIDERS[name]
-            provider = provider_class()
-            if provider.is_available():
-                return provider
+        # Auto-detect: the chain is already in preference order
+        if available:
+            return available[0][1]
 
         raise RuntimeError("No AI providers available")
 
@@ -311,3 +326,22 @@ class AIGenerator:
             f"suitable for social media preview, no text, "
             f"gradient elements, professional corporate style"
         )
+
+
+# Fallback order: quality first (OpenAI), then free (Pollinations), then Gemini
+PROVIDER_ORDER = ('openai', 'pollinations', 'gemini')
+
+
+@lru_cache(maxsize=1)
+def _available_providers() -> Tuple[Tuple[str, AIProvider], ...]:
+    """The usable providers as (name, instance), in fallback order.
+
+    Resolved on first use and shared by every AIGenerator in the process,
+    so a batch run checks API keys once rather than once per brand.
+    """
+    chain = []
+    for name in PROVIDER_ORDER:
+        provider = AIGenerator.PROVIDERS[name]()
+        if provider.is_available():
+            chain.append((name, provider))
+    return tuple(chain)
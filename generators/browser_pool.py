@@ -0,0 +1,82 @@
+"""Shared Playwright browsers, launched once per thread and reused."""
+import threading
+
+try:
+    from playwright.sync_api import sync_playwright
+except ImportError:
+    sync_playwright = None
+
+PLAYWRIGHT_AVAILABLE = sync_playwright is not None
+
+
+# Sync Playwright objects only work on the thread that created them, so
+# each worker thread keeps its own browser instead of sharing one.
+_local = threading.local()
+
+
+def get_browser():
+    """Get this thread's browser, launching Chromium on first use.
+
+    Launching is the expensive part of a render (hundreds of ms); pages
+    opened on an already-running browser are cheap.
+    """
+    browser = getattr(_local, 'browser', None)
+    if browser is not None and browser.is_connected():
+        return browser
+
+    # Drop a browser that crashed or was closed underneath us
+    close_browser()
+
+    if sync_playwright is None:
+        raise RuntimeError(
+            "Playwright not installed. Run: pip install playwright && playwright install chromium"
+        )
+
+    playwright = sync_playwright().start()
+    try:
+        browser = playwright.chromium.launch(headless=True)
+    except Exception:
+        playwright.stop()
+        raise
+
+    _local.playwright = playwright
+    _local.browser = browser
+    return browser
+
+
+def close_browser():
+    """Close this thread's browser (if any) and stop Playwright."""
+    browser = getattr(_local, 'browser', None)
+    playwright = getattr(_local, 'playwright', None)
+    _local.browser = None
+    _local.playwright = None
+
+    if browser is not None:
+        try:
+            browser.close()
+        except Exception:
+            pass  # Already gone
+    if playwright is not None:
+        playwright.stop()
+
+
+def close_pool_browsers(executor, workers: int, timeout: float = 30):
+    """Close the browser of every worker thread of a ThreadPoolExecutor.
+
+    Browsers can only be closed from the thread that launched them, so
+    this runs close_browser() as one job per worker. Each job waits at a
+    barrier until all of them are running, which puts them on distinct
+    threads. workers must be the executor's max_workers; call it after
+    the last render job was submitted.
+    """
+    barrier = threading.Barrier(workers)
+
+    def close_and_wait():
+        close_browser()
+        try:
+            barrier.wait(timeout)
+        except threading.BrokenBarrierError:
+            pass
+
+    for future in [executor.submit(close_and_wait) for _ in range(workers)]:
+        future.result()
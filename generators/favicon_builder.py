@@ -1,10 +1,21 @@
 """Build favicon set from source image."""
+import io
 import json
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional
 
 from PIL import Image
 
+# Optional: oxipng recompresses PNGs smaller than Pillow's optimize, and faster
+try:
+    import oxipng
+except ImportError:
+    oxipng = None
+
 
 # Standard favicon sizes
 FAVICON_SIZES = {
@@ -18,23 +29,56 @@ FAVICON_SIZES = {
 # ICO file contains multiple sizes
 ICO_SIZES = [16, 32, 48]
 
+LANCZOS = Image.Resampling.LANCZOS
+
 
 class FaviconBuilder:
     """Build complete favicon set from source image."""
 
-    def __init__(self, source_image: Image.Image, theme_color: str = '#000000'):
+    def __init__(
+        self,
+        source_image: Image.Image,
+        theme_color: str = '#000000',
+        png_compress_level: Optional[int] = 1
+    ):
         """Initialize with source image.
 
         Args:
             source_image: PIL Image (should be 512x512 for best quality)
             theme_color: Hex color for manifest theme_color
+            png_compress_level: zlib level (0-9) for fast PNG saves;
+                None for slower, smallest optimized PNGs
         """
-        # Ensure RGBA
+        # Ensure RGBA (an RGBA source is used as-is, not copied)
         if source_image.mode != 'RGBA':
             source_image = source_image.convert('RGBA')
+        # Decode up front; sizes are resized from it in parallel
+        source_image.load()
 
         self.source = source_image
+        self.levels = self._build_pyramid()
         self.theme_color = theme_color
+        self.png_compress_level = png_compress_level
+
+    def encode_all(self) -> Dict[str, bytes]:
+        """Encode all favicon files without writing them.
+
+        Returns:
+            Dict mapping filename to file contents, in FAVICON_SIZES
+            order followed by favicon.ico and site.webmanifest
+        """
+        # Every size is encoded to PNG exactly once; the ICO embeds the same
+        # PNG bytes as the 16/32 files. Each resize + encode is independent
+        # and Pillow releases the GIL for both, so they run in parallel.
+        sizes = sorted(set(FAVICON_SIZES.values()) | set(ICO_SIZES))
+        workers = min(len(sizes), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pngs = dict(zip(sizes, executor.map(self._encode_png, sizes)))
+
+        files = {filename: pngs[size] for filename, size in FAVICON_SIZES.items()}
+        files['favicon.ico'] = self._encode_ico([pngs[size] for size in ICO_SIZES])
+        files['site.webmanifest'] = self._encode_manifest()
+        return files
 
     def build_all(self, output_dir: Path, verbose: bool = False) -> Dict[str, Path]:
         """Generate all favicon files.
@@ -46,87 +90,175 @@ class FaviconBuilder:
         Returns:
             Dict mapping filename to Path
         """
-        output_dir = Path(output_dir)
-        output_dir.mkdir(parents=True, exist_ok=True)
-
-        generated = {}
-
-        # Generate PNG files at each size
-        for filename, size in FAVICON_SIZES.items():
-            path = output_dir / filename
-            resized = self._resize(size)
-            resized.save(path, 'PNG', optimize=True)
-            generated[filename] = path
-            if verbose:
-                print(f"  Created {filename} ({size}x{size})")
-
-        # Generate ICO file with multiple sizes
-        ico_path = output_dir / 'favicon.ico'
-        self._save_ico(ico_path)
-        generated['favicon.ico'] = ico_path
-        if verbose:
-            print(f"  Created favicon.ico ({', '.join(str(s) for s in ICO_SIZES)})")
+        return write_favicon_set(self.encode_all(), output_dir, verbose)
 
-        # Generate site.webmanifest
-        manifest_path = output_dir / 'site.webmanifest'
-        self._save_manifest(manifest_path)
-        generated['site.webmanifest'] = manifest_path
-        if verbose:
-            print(f"  Created site.webmanifest")
+    def _build_pyramid(self) -> List[Image.Image]:
+        """Halve the source repeatedly, down to the smallest favicon size.
 
-        return generated
+        Returns the levels largest first, starting with the source itself.
+        Small icons are then resized from a nearby level instead of running
+        the Lanczos kernel over the full-size source each time.
+        """
+        smallest = min(*FAVICON_SIZES.values(), *ICO_SIZES)
+        levels = [self.source]
+        while min(levels[-1].size) // 2 >= smallest:
+            width, height = levels[-1].size
+            levels.append(levels[-1].resize(
+                (width // 2, height // 2),
+                resample=LANCZOS
+            ))
+        return levels
 
     def _resize(self, size: int) -> Image.Image:
-        """Resize source image to target size with high quality."""
-        return self.source.resize(
+        """Resize to target size from the smallest pyramid level that covers it."""
+        base = self.source
+        for level in self.levels:
+            if min(level.size) < size:
+                break
+            base = level
+
+        if base.size == (size, size):
+            return base
+        return base.resize(
             (size, size),
-            resample=Image.Resampling.LANCZOS
+            resample=LANCZOS
         )
 
-    def _save_ico(self, path: Path):
-        """Save multi-size ICO file."""
-        # Create images at each ICO size
-        images = [self._resize(size) for size in ICO_SIZES]
-
-        # Save as ICO
-        images[0].save(
-            path,
-            format='ICO',
-            sizes=[(s, s) for s in ICO_SIZES],
-            append_images=images[1:]
-        )
+    def _encode_png(self, size: int) -> bytes:
+        """Encode source resized to size as a PNG."""
+        return encode_png(self._resize(size), self.png_compress_level)
+
+    def _encode_ico(self, pngs: List[bytes]) -> bytes:
+        """Pack PNG-encoded ICO_SIZES images into a multi-size ICO file.
+
+        ICO allows PNG payloads, so this is just the 6-byte header and one
+        16-byte directory entry per image, followed by the PNGs.
+        """
+        header = struct.pack('<HHH', 0, 1, len(pngs))  # reserved, type=icon, count
+        offset = len(header) + 16 * len(pngs)
+
+        entries = []
+        for size, png in zip(ICO_SIZES, pngs):
+            # Width/height 0 means 256; no palette, 1 plane, 32 bpp
+            entries.append(struct.pack(
+                '<BBBBHHII', size & 0xFF, size & 0xFF, 0, 0, 1, 32, len(png), offset
+            ))
+            offset += len(png)
+
+        return b''.join([header, *entries, *pngs])
+
+    def _encode_manifest(self) -> bytes:
+        """Encode site.webmanifest file."""
+        return _manifest_bytes(self.theme_color)
+
+
+# The manifest only varies by theme color; batch runs reuse the bytes
+@lru_cache(maxsize=64)
+def _manifest_bytes(theme_color: str) -> bytes:
+    """Encode site.webmanifest for theme_color."""
+    manifest = {
+        "name": "",
+        "short_name": "",
+        "icons": [
+            {
+                "src": "/android-chrome-192x192.png",
+                "sizes": "192x192",
+                "type": "image/png"
+            },
+            {
+                "src": "/android-chrome-512x512.png",
+                "sizes": "512x512",
+                "type": "image/png"
+            }
+        ],
+        "theme_color": theme_color,
+        "background_color": theme_color,
+        "display": "standalone"
+    }
+
+    return json.dumps(manifest, indent=2).encode()
+
+
+def encode_png(image: Image.Image, compress_level: Optional[int] = 1) -> bytes:
+    """Encode image as PNG bytes.
+
+    Args:
+        image: Image to encode
+        compress_level: zlib level (0-9); 1 is fast and only slightly
+            larger. None for the smallest file: a fast encode recompressed
+            by oxipng when it is installed, else Pillow's optimize
+    """
+    buffer = io.BytesIO()
+    if compress_level is None and oxipng is None:
+        image.save(buffer, 'PNG', optimize=True)
+        return buffer.getvalue()
 
-    def _save_manifest(self, path: Path):
-        """Save site.webmanifest file."""
-        manifest = {
-            "name": "",
-            "short_name": "",
-            "icons": [
-                {
-                    "src": "/android-chrome-192x192.png",
-                    "sizes": "192x192",
-                    "type": "image/png"
-                },
-                {
-                    "src": "/android-chrome-512x512.png",
-                    "sizes": "512x512",
-                    "type": "image/png"
-                }
-            ],
-            "theme_color": self.theme_color,
-            "background_color": self.theme_color,
-            "display": "standalone"
-        }
-
-        with open(path, 'w') as f:
-            json.dump(manifest, f, indent=2)
+    image.save(buffer, 'PNG', compress_level=1 if compress_level is None else compress_level)
+    if compress_level is None:
+        return oxipng.optimize_from_memory(buffer.getvalue(), level=3)
+    return buffer.getvalue()
+
+
+def write_favicon_set(
+    files: Dict[str, bytes],
+    output_dir: Path,
+    verbose: bool = False
+) -> Dict[str, Path]:
+    """Write favicon files from encode_favicon_set to output_dir.
+
+    Args:
+        files: Dict mapping filename to file contents
+        output_dir: Output directory
+        verbose: Print progress
+
+    Returns:
+        Dict mapping filename to Path
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    generated = {}
+    for filename, content in files.items():
+        path = output_dir / filename
+        path.write_bytes(content)
+        generated[filename] = path
+        if verbose:
+            if filename in FAVICON_SIZES:
+                size = FAVICON_SIZES[filename]
+                print(f"  Created {filename} ({size}x{size})")
+            elif filename == 'favicon.ico':
+                print(f"  Created favicon.ico ({', '.join(str(s) for s in ICO_SIZES)})")
+            else:
+                print(f"  Created {filename}")
+
+    return generated
+
+
+def encode_favicon_set(
+    source: Image.Image,
+    theme_color: str = '#000000',
+    png_compress_level: Optional[int] = 1
+) -> Dict[str, bytes]:
+    """Convenience function to encode a favicon set in memory.
+
+    Args:
+        source: Source image (512x512 recommended)
+        theme_color: Theme color for manifest
+        png_compress_level: zlib level for fast PNG saves (None = optimize)
+
+    Returns:
+        Dict mapping filename to file contents
+    """
+    builder = FaviconBuilder(source, theme_color, png_compress_level)
+    return builder.encode_all()
 
 
 def build_favicon_set(
     source: Image.Image,
     output_dir: Path,
     theme_color: str = '#000000',
-    verbose: bool = False
+    verbose: bool = False,
+    png_compress_level: Optional[int] = 1
 ) -> Dict[str, Path]:
     """Convenience function to build favicon set.
 
@@ -135,9 +267,10 @@ def build_favicon_set(
         output_dir: Output directory
         theme_color: Theme color for manifest
         verbose: Print progress
+        png_compress_level: zlib level for fast PNG saves (None = optimize)
 
     Returns:
         Dict of generated files
     """
-    builder = FaviconBuilder(source, theme_color)
+    builder = FaviconBuilder(source, theme_color, png_compress_level)
     return builder.build_all(output_dir, verbose)
@@ -1,23 +1,240 @@
 """HTML/CSS-based image generator using Playwright."""
 import io
-import tempfile
-from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Tuple, Union
 
 from PIL import Image
 
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent))
-from models.brand_identity import BrandIdentity, StyleConfig
+from models.brand_identity import BG_EFFECTS, BrandIdentity, StyleConfig
+from generators.browser_pool import PLAYWRIGHT_AVAILABLE, get_browser
+from utils.color_utils import blend_colors, hex_to_rgb_str
+from utils.fonts import google_fonts_url, inline_google_font_css
 
 
-# Check if Playwright is available
-PLAYWRIGHT_AVAILABLE = False
-try:
-    from playwright.sync_api import sync_playwright
-    PLAYWRIGHT_AVAILABLE = True
-except ImportError:
-    pass
+# Tagline px sizes (for a 1200px wide image) -> viewport-relative sizes
+TAGLINE_VW_SIZES = {26: '2.2vw', 24: '2vw', 22: '1.8vw', 20: '1.7vw'}
+
+
+class _Scaled:
+    """Template lookup '{dec[0.35]}' -> 0.35 * the decoration intensity."""
+
+    def __init__(self, factor: float):
+        self.factor = factor
+
+    def __getitem__(self, key: str) -> float:
+        return float(key) * self.factor
+
+
+class _Blends:
+    """Template lookup '{blend[bg,primary,0.15]}' -> blend_colors(bg, primary, 0.15).
+
+    Color names are looked up in colors; anything else is taken as a hex color.
+    """
+
+    def __init__(self, colors: Dict[str, str]):
+        self.colors = colors
+
+    def __getitem__(self, key: str) -> str:
+        color1, color2, factor = key.split(',')
+        return blend_colors(
+            self.colors.get(color1, color1), self.colors.get(color2, color2), float(factor)
+        )
+
+
+# bg_effect -> (background CSS, extra HTML, extra CSS) str.format templates,
+# filled from HTMLGenerator._bg_effect_context()
+EFFECT_TEMPLATES = {
+    # Original smooth radial blobs
+    'aurora': (
+        '''
+                /* Accent blob - top right */
+                radial-gradient(
+                    ellipse 700px 500px at 85% 15%,
+                    rgba({accent_rgb}, {dec[0.35]}) 0%,
+                    rgba({accent_rgb}, {dec[0.1]}) 40%,
+                    transparent 70%
+                ),
+                /* Primary blob - bottom left */
+                radial-gradient(
+                    ellipse 500px 400px at 10% 90%,
+                    rgba({primary_rgb}, {dec[0.25]}) 0%,
+                    rgba({primary_rgb}, {dec[0.05]}) 50%,
+                    transparent 70%
+                ),
+                /* Subtle center glow */
+                radial-gradient(
+                    ellipse 800px 400px at 50% 50%,
+                    rgba({primary_rgb}, {dec[0.08]}) 0%,
+                    transparent 60%
+                ),
+                /* Base gradient */
+                linear-gradient(
+                    {angle}deg,
+                    {bg} 0%,
+                    {blend[bg,primary,0.15]} 100%
+                )''',
+        '',
+        '',
+    ),
+    # Multi-point mesh gradient - 6 overlapping radials
+    'mesh': (
+        '''
+                radial-gradient(ellipse 600px 400px at 20% 20%, rgba({accent_rgb}, {dec[0.4]}) 0%, transparent 60%),
+                radial-gradient(ellipse 500px 500px at 80% 30%, rgba({primary_rgb}, {dec[0.35]}) 0%, transparent 55%),
+                radial-gradient(ellipse 400px 350px at 60% 70%, rgba({accent_rgb}, {dec[0.3]}) 0%, transparent 50%),
+                radial-gradient(ellipse 550px 400px at 10% 80%, rgba({primary_rgb}, {dec[0.25]}) 0%, transparent 60%),
+                radial-gradient(ellipse 450px 300px at 90% 85%, rgba({accent_rgb}, {dec[0.2]}) 0%, transparent 50%),
+                radial-gradient(ellipse 700px 500px at 50% 50%, rgba({primary_rgb}, {dec[0.1]}) 0%, transparent 70%),
+                linear-gradient({angle}deg, {bg} 0%, {blend[bg,primary,0.1]} 100%)''',
+        '',
+        '',
+    ),
+    # Grainy textured gradient with SVG noise overlay
+    'noise': (
+        '''
+                linear-gradient({angle}deg,
+                    {bg} 0%,
+                    {blend[bg,primary,0.2]} 50%,
+                    {blend[bg,accent,0.15]} 100%)''',
+        '''
+            <svg width="0" height="0" style="position:absolute">
+                <filter id="grain">
+                    <feTurbulence type="fractalNoise" baseFrequency="0.65" numOctaves="3" stitchTiles="stitch"/>
+                    <feColorMatrix type="saturate" values="0"/>
+                </filter>
+            </svg>
+            <div class="noise-overlay"></div>''',
+        '''
+            .noise-overlay {{
+                position: absolute;
+                top: 0; left: 0; right: 0; bottom: 0;
+                filter: url(#grain);
+                opacity: {dec[0.12]};
+                mix-blend-mode: overlay;
+                pointer-events: none;
+                z-index: 2;
+            }}''',
+    ),
+    # Layered SVG wave curves
+    'waves': (
+        '''linear-gradient({angle}deg, {bg} 0%, {blend[bg,primary,0.1]} 100%)''',
+        '''
+            <svg class="wave-bg" viewBox="0 0 1200 630" preserveAspectRatio="none" xmlns="http://www.w3.org/2000/svg">
+                <path d="M0,500 C200,450 400,550 600,480 C800,410 1000,520 1200,470 L1200,630 L0,630 Z" fill="{blend[primary,bg,0.7]}" opacity="{dec[0.4]}"/>
+                <path d="M0,530 C300,480 500,580 700,510 C900,440 1100,550 1200,500 L1200,630 L0,630 Z" fill="{blend[accent,bg,0.8]}" opacity="{dec[0.3]}"/>
+                <path d="M0,560 C250,520 450,600 650,550 C850,500 1050,580 1200,540 L1200,630 L0,630 Z" fill="{primary}" opacity="{dec[0.2]}"/>
+            </svg>''',
+        '''
+            .wave-bg {{
+                position: absolute;
+                bottom: 0;
+                left: 0;
+                width: 100%;
+                height: 100%;
+                z-index: 1;
+                pointer-events: none;
+            }}''',
+    ),
+    # Dramatic corner lighting
+    'spotlight': (
+        '''
+                radial-gradient(ellipse 1000px 800px at 95% 5%, rgba({accent_rgb}, {dec[0.5]}) 0%, transparent 50%),
+                radial-gradient(ellipse 600px 600px at 90% 10%, rgba(255, 255, 255, {dec[0.15]}) 0%, transparent 40%),
+                radial-gradient(ellipse 400px 400px at 5% 95%, rgba({primary_rgb}, {dec[0.2]}) 0%, transparent 50%),
+                linear-gradient({angle}deg, {bg} 0%, {blend[bg,#000000,0.1]} 100%)''',
+        '',
+        '',
+    ),
+    # Clean simple gradient, no decorations
+    'minimal': (
+        '''linear-gradient({angle}deg, {bg} 0%, {blend[bg,primary,0.15]} 100%)''',
+        '',
+        '',
+    ),
+    # Glassmorphism with blur
+    'glass': (
+        '''linear-gradient({angle}deg, {bg} 0%, {blend[bg,primary,0.15]} 100%)''',
+        '''
+            <div class="glass-shape glass-1"></div>
+            <div class="glass-shape glass-2"></div>
+            <div class="glass-shape glass-3"></div>''',
+        '''
+            .glass-shape {{
+                position: absolute;
+                border-radius: 50%;
+                background: linear-gradient(135deg,
+                    rgba({accent_rgb}, {dec[0.3]}) 0%,
+                    rgba({primary_rgb}, {dec[0.1]}) 100%);
+                filter: blur(40px);
+                z-index: 1;
+            }}
+            .glass-1 {{
+                width: 400px; height: 400px;
+                top: -100px; right: -50px;
+            }}
+            .glass-2 {{
+                width: 300px; height: 300px;
+                bottom: -80px; left: -60px;
+                background: linear-gradient(135deg,
+                    rgba({primary_rgb}, {dec[0.25]}) 0%,
+                    rgba({accent_rgb}, {dec[0.1]}) 100%);
+            }}
+            .glass-3 {{
+                width: 200px; height: 200px;
+                top: 40%; left: 30%;
+                background: rgba(255, 255, 255, {dec[0.1]});
+                filter: blur(60px);
+            }}''',
+    ),
+    # Subtle dot pattern overlay, in the accent color for visibility on dark backgrounds
+    'dots': (
+        '''linear-gradient({angle}deg, {bg} 0%, {blend[bg,primary,0.1]} 100%)''',
+        '''<div class="dots-overlay"></div>''',
+        '''
+            .dots-overlay {{
+                position: absolute;
+                top: 0; left: 0; right: 0; bottom: 0;
+                background-image: radial-gradient(circle, rgba({accent_rgb}, {dec[0.25]}) 3px, transparent 3px);
+                background-size: 30px 30px;
+                z-index: 1;
+                pointer-events: none;
+            }}''',
+    ),
+    # Bold diagonal color split
+    'diagonal': (
+        '''
+                linear-gradient(135deg,
+                    {bg} 0%,
+                    {bg} 45%,
+                    {blend[primary,bg,0.5]} 45%,
+                    {blend[primary,bg,0.5]} 55%,
+                    {blend[bg,accent,0.2]} 55%,
+                    {blend[bg,accent,0.2]} 100%)''',
+        '',
+        '',
+    ),
+    # Subtle geometric grid pattern, in the accent color for visibility
+    'geometric': (
+        '''linear-gradient({angle}deg, {bg} 0%, {blend[bg,primary,0.08]} 100%)''',
+        '''<div class="geo-overlay"></div>''',
+        '''
+            .geo-overlay {{
+                position: absolute;
+                top: 0; left: 0; right: 0; bottom: 0;
+                background-image:
+                    linear-gradient(0deg, rgba({accent_rgb}, {dec[0.15]}) 1px, transparent 1px),
+                    linear-gradient(90deg, rgba({accent_rgb}, {dec[0.15]}) 1px, transparent 1px);
+                background-size: 50px 50px;
+                z-index: 1;
+                pointer-events: none;
+            }}''',
+    ),
+}
+
+# OG previews are opaque and get re-encoded as JPEG by social sites anyway
+OG_JPEG_QUALITY = 92
+
+# Every selectable effect needs templates
+assert EFFECT_TEMPLATES.keys() == BG_EFFECTS.keys()
 
 
 def is_playwright_available() -> bool:
@@ -26,10 +243,9 @@ def is_playwright_available() -> bool:
         return False
 
     try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            browser.close()
-            return True
+        # Launching the shared browser doubles as warm-up for the first render
+        get_browser()
+        return True
     except Exception:
         return False
 
@@ -46,42 +262,53 @@ class HTMLGenerator:
                 "Playwright not installed. Run: pip install playwright && playwright install chromium"
             )
 
-    def get_logo_html(self, size: int = 512) -> str:
+    def get_logo_html(self, size: int = 512, responsive: bool = False) -> str:
         """Get HTML for logo (for live preview).
 
         Args:
             size: Image size (square)
+            responsive: Size with viewport units so it fills an iframe
 
         Returns:
             HTML string
         """
-        return self._build_logo_html(size)
+        return self._build_logo_html(size, responsive)
 
-    def _build_logo_html(self, size: int = 512) -> str:
-        """Build HTML for logo."""
+    def _build_logo_html(
+        self, size: int = 512, responsive: bool = False, inline_fonts: bool = False
+    ) -> str:
+        """Build HTML for logo (inline_fonts embeds the font files, for rendering)."""
         # Calculate proportional sizes
-        border_radius = size // 5
-        font_size = int(size * 0.42)
-        inner_size = size - 20
+        if responsive:
+            body_width, body_height = '100vw', '100vh'
+            inner_width, inner_height = '96vw', '96vh'
+            border_radius = '20%'
+            font_size = '42vw'
+            letter_spacing = '-0.8vw'
+        else:
+            body_width = body_height = f'{size}px'
+            inner_width = inner_height = f'{size - 20}px'
+            border_radius = f'{size // 5}px'
+            font_size = f'{int(size * 0.42)}px'
+            letter_spacing = '-4px'
 
         # RGB strings for rgba()
         accent_rgb = self._hex_to_rgb_str(self.brand.accent_color)
         primary_rgb = self._hex_to_rgb_str(self.brand.primary_color)
 
-        # URL-encode font name for Google Fonts
-        font_encoded = self.style.font.replace(' ', '+')
+        font_css = self._font_css(str(self.style.font_weight), inline_fonts)
 
         return f'''<!DOCTYPE html>
 <html>
 <head>
     <style>
-        @import url('https://fonts.googleapis.com/css2?family={font_encoded}:wght@{self.style.font_weight}&display=swap');
+        {font_css}
 
         * {{ margin: 0; padding: 0; box-sizing: border-box; }}
 
         body {{
-            width: {size}px;
-            height: {size}px;
+            width: {body_width};
+            height: {body_height};
             display: flex;
             justify-content: center;
             align-items: center;
@@ -89,9 +316,9 @@ class HTMLGenerator:
         }}
 
         .logo {{
-            width: {inner_size}px;
-            height: {inner_size}px;
-            border-radius: {border_radius}px;
+            width: {inner_width};
+            height: {inner_height};
+            border-radius: {border_radius};
             display: flex;
             justify-content: center;
             align-items: center;
@@ -123,10 +350,10 @@ class HTMLGenerator:
 
         .initials {{
             color: {self.brand.accent_color};
-            font-size: {font_size}px;
+            font-size: {font_size};
             font-weight: {self.style.font_weight};
             font-family: '{self.style.font}', -apple-system, BlinkMacSystemFont, sans-serif;
-            letter-spacing: -4px;
+            letter-spacing: {letter_spacing};
             text-shadow:
                 0 0 40px rgba({accent_rgb}, {0.5 * self.style.glow if self.style.show_glow else 0}),
                 0 2px 4px rgba(0, 0, 0, {0.3 * self.style.depth});
@@ -149,20 +376,21 @@ class HTMLGenerator:
         Returns:
             PIL Image (RGBA)
         """
-        html = self._build_logo_html(size)
+        html = self._build_logo_html(size, inline_fonts=True)
         return self._render_html(html, size, size, transparent=True)
 
-    def get_og_html(self, width: int = 1200, height: int = 630) -> str:
+    def get_og_html(self, width: int = 1200, height: int = 630, responsive: bool = False) -> str:
         """Get HTML for OG image (for live preview).
 
         Args:
             width: Image width
             height: Image height
+            responsive: Size with viewport units so it fills an iframe
 
         Returns:
             HTML string
         """
-        return self._build_og_html(width, height)
+        return self._build_og_html(width, height, responsive)
 
     def _get_bg_effect_css(self, width: int, height: int) -> tuple[str, str]:
         """Get CSS for background effect.
@@ -170,226 +398,42 @@ class HTMLGenerator:
         Returns:
             Tuple of (background CSS property value, extra HTML elements)
         """
-        effect = self.style.bg_effect
-        accent_rgb = self._hex_to_rgb_str(self.brand.accent_color)
-        primary_rgb = self._hex_to_rgb_str(self.brand.primary_color)
-        bg_rgb = self._hex_to_rgb_str(self.brand.background_color)
-        dec = self.style.decoration
-        angle = self.style.gradient_angle
-
-        extra_html = ""
-
-        if effect == 'aurora':
-            # Original smooth radial blobs
-            bg_css = f'''
-                /* Accent blob - top right */
-                radial-gradient(
-                    ellipse 700px 500px at 85% 15%,
-                    rgba({accent_rgb}, {0.35 * dec}) 0%,
-                    rgba({accent_rgb}, {0.1 * dec}) 40%,
-                    transparent 70%
-                ),
-                /* Primary blob - bottom left */
-                radial-gradient(
-                    ellipse 500px 400px at 10% 90%,
-                    rgba({primary_rgb}, {0.25 * dec}) 0%,
-                    rgba({primary_rgb}, {0.05 * dec}) 50%,
-                    transparent 70%
-                ),
-                /* Subtle center glow */
-                radial-gradient(
-                    ellipse 800px 400px at 50% 50%,
-                    rgba({primary_rgb}, {0.08 * dec}) 0%,
-                    transparent 60%
-                ),
-                /* Base gradient */
-                linear-gradient(
-                    {angle}deg,
-                    {self.brand.background_color} 0%,
-                    {self._blend_colors(self.brand.background_color, self.brand.primary_color, 0.15)} 100%
-                )'''
-
-        elif effect == 'mesh':
-            # Multi-point mesh gradient - 6 overlapping radials
-            bg_css = f'''
-                radial-gradient(ellipse 600px 400px at 20% 20%, rgba({accent_rgb}, {0.4 * dec}) 0%, transparent 60%),
-                radial-gradient(ellipse 500px 500px at 80% 30%, rgba({primary_rgb}, {0.35 * dec}) 0%, transparent 55%),
-                radial-gradient(ellipse 400px 350px at 60% 70%, rgba({accent_rgb}, {0.3 * dec}) 0%, transparent 50%),
-                radial-gradient(ellipse 550px 400px at 10% 80%, rgba({primary_rgb}, {0.25 * dec}) 0%, transparent 60%),
-                radial-gradient(ellipse 450px 300px at 90% 85%, rgba({accent_rgb}, {0.2 * dec}) 0%, transparent 50%),
-                radial-gradient(ellipse 700px 500px at 50% 50%, rgba({primary_rgb}, {0.1 * dec}) 0%, transparent 70%),
-                linear-gradient({angle}deg, {self.brand.background_color} 0%, {self._blend_colors(self.brand.background_color, self.brand.primary_color, 0.1)} 100%)'''
-
-        elif effect == 'noise':
-            # Grainy textured gradient with SVG noise overlay
-            bg_css = f'''
-                linear-gradient({angle}deg,
-                    {self.brand.background_color} 0%,
-                    {self._blend_colors(self.brand.background_color, self.brand.primary_color, 0.2)} 50%,
-                    {self._blend_colors(self.brand.background_color, self.brand.accent_color, 0.15)} 100%)'''
-            # Add SVG noise filter overlay
-            extra_html = f'''
-            <svg width="0" height="0" style="position:absolute">
-                <filter id="grain">
-                    <feTurbulence type="fractalNoise" baseFrequency="0.65" numOctaves="3" stitchTiles="stitch"/>
-                    <feColorMatrix type="saturate" values="0"/>
-                </filter>
-            </svg>
-            <div class="noise-overlay"></div>'''
-
-        elif effect == 'waves':
-            # Layered SVG wave curves
-            wave_color1 = self._blend_colors(self.brand.primary_color, self.brand.background_color, 0.7)
-            wave_color2 = self._blend_colors(self.brand.accent_color, self.brand.background_color, 0.8)
-            bg_css = f'''linear-gradient({angle}deg, {self.brand.background_color} 0%, {self._blend_colors(self.brand.background_color, self.brand.primary_color, 0.1)} 100%)'''
-            extra_html = f'''
-            <svg class="wave-bg" viewBox="0 0 1200 630" preserveAspectRatio="none" xmlns="http://www.w3.org/2000/svg">
-                <path d="M0,500 C200,450 400,550 600,480 C800,410 1000,520 1200,470 L1200,630 L0,630 Z" fill="{wave_color1}" opacity="{0.4 * dec}"/>
-                <path d="M0,530 C300,480 500,580 700,510 C900,440 1100,550 1200,500 L1200,630 L0,630 Z" fill="{wave_color2}" opacity="{0.3 * dec}"/>
-                <path d="M0,560 C250,520 450,600 650,550 C850,500 1050,580 1200,540 L1200,630 L0,630 Z" fill="{self.brand.primary_color}" opacity="{0.2 * dec}"/>
-            </svg>'''
-
-        elif effect == 'spotlight':
-            # Dramatic corner lighting
-            bg_css = f'''
-                radial-gradient(ellipse 1000px 800px at 95% 5%, rgba({accent_rgb}, {0.5 * dec}) 0%, transparent 50%),
-                radial-gradient(ellipse 600px 600px at 90% 10%, rgba(255, 255, 255, {0.15 * dec}) 0%, transparent 40%),
-                radial-gradient(ellipse 400px 400px at 5% 95%, rgba({primary_rgb}, {0.2 * dec}) 0%, transparent 50%),
-                linear-gradient({angle}deg, {self.brand.background_color} 0%, {self._blend_colors(self.brand.background_color, '#000000', 0.1)} 100%)'''
-
-        elif effect == 'minimal':
-            # Clean simple gradient, no decorations
-            bg_css = f'''linear-gradient({angle}deg, {self.brand.background_color} 0%, {self._blend_colors(self.brand.background_color, self.brand.primary_color, 0.15)} 100%)'''
-
-        elif effect == 'glass':
-            # Glassmorphism with blur
-            bg_css = f'''linear-gradient({angle}deg, {self.brand.background_color} 0%, {self._blend_colors(self.brand.background_color, self.brand.primary_color, 0.15)} 100%)'''
-            extra_html = f'''
-            <div class="glass-shape glass-1"></div>
-            <div class="glass-shape glass-2"></div>
-            <div class="glass-shape glass-3"></div>'''
-
-        elif effect == 'dots':
-            # Subtle dot pattern overlay
-            bg_css = f'''linear-gradient({angle}deg, {self.brand.background_color} 0%, {self._blend_colors(self.brand.background_color, self.brand.primary_color, 0.1)} 100%)'''
-            # Tiled dots via overlay
-            extra_html = f'''<div class="dots-overlay"></div>'''
-
-        elif effect == 'diagonal':
-            # Bold diagonal color split
-            split_color = self._blend_colors(self.brand.primary_color, self.brand.background_color, 0.5)
-            bg_css = f'''
-                linear-gradient(135deg,
-                    {self.brand.background_color} 0%,
-                    {self.brand.background_color} 45%,
-                    {split_color} 45%,
-                    {split_color} 55%,
-                    {self._blend_colors(self.brand.background_color, self.brand.accent_color, 0.2)} 55%,
-                    {self._blend_colors(self.brand.background_color, self.brand.accent_color, 0.2)} 100%)'''
-
-        elif effect == 'geometric':
-            # Subtle geometric grid pattern
-            bg_css = f'''linear-gradient({angle}deg, {self.brand.background_color} 0%, {self._blend_colors(self.brand.background_color, self.brand.primary_color, 0.08)} 100%)'''
-            # Grid via overlay
-            extra_html = f'''<div class="geo-overlay"></div>'''
-
-        else:
-            # Fallback to aurora
-            return self._get_bg_effect_css_aurora(width, height, dec, accent_rgb, primary_rgb, angle)
-
-        return bg_css, extra_html
+        bg_template, html_template, _ = self._bg_effect_templates()
+        context = self._bg_effect_context()
+        return bg_template.format_map(context), html_template.format_map(context)
 
     def _get_bg_effect_extra_styles(self) -> str:
         """Get extra CSS styles for background effects."""
-        effect = self.style.bg_effect
-        dec = self.style.decoration
-        accent_rgb = self._hex_to_rgb_str(self.brand.accent_color)
-        primary_rgb = self._hex_to_rgb_str(self.brand.primary_color)
-
-        if effect == 'noise':
-            return f'''
-            .noise-overlay {{
-                position: absolute;
-                top: 0; left: 0; right: 0; bottom: 0;
-                filter: url(#grain);
-                opacity: {0.12 * dec};
-                mix-blend-mode: overlay;
-                pointer-events: none;
-                z-index: 2;
-            }}'''
-
-        elif effect == 'waves':
-            return '''
-            .wave-bg {
-                position: absolute;
-                bottom: 0;
-                left: 0;
-                width: 100%;
-                height: 100%;
-                z-index: 1;
-                pointer-events: none;
-            }'''
-
-        elif effect == 'glass':
-            return f'''
-            .glass-shape {{
-                position: absolute;
-                border-radius: 50%;
-                background: linear-gradient(135deg,
-                    rgba({accent_rgb}, {0.3 * dec}) 0%,
-                    rgba({primary_rgb}, {0.1 * dec}) 100%);
-                filter: blur(40px);
-                z-index: 1;
-            }}
-            .glass-1 {{
-                width: 400px; height: 400px;
-                top: -100px; right: -50px;
-            }}
-            .glass-2 {{
-                width: 300px; height: 300px;
-                bottom: -80px; left: -60px;
-                background: linear-gradient(135deg,
-                    rgba({primary_rgb}, {0.25 * dec}) 0%,
-                    rgba({accent_rgb}, {0.1 * dec}) 100%);
-            }}
-            .glass-3 {{
-                width: 200px; height: 200px;
-                top: 40%; left: 30%;
-                background: rgba(255, 255, 255, {0.1 * dec});
-                filter: blur(60px);
-            }}'''
-
-        elif effect == 'dots':
-            # Use accent color for better visibility on dark backgrounds
-            accent_rgb = self._hex_to_rgb_str(self.brand.accent_color)
-            return f'''
-            .dots-overlay {{
-                position: absolute;
-                top: 0; left: 0; right: 0; bottom: 0;
-                background-image: radial-gradient(circle, rgba({accent_rgb}, {0.25 * dec}) 3px, transparent 3px);
-                background-size: 30px 30px;
-                z-index: 1;
-                pointer-events: none;
-            }}'''
-
-        elif effect == 'geometric':
-            # Use accent color blended for better visibility
-            accent_rgb = self._hex_to_rgb_str(self.brand.accent_color)
-            return f'''
-            .geo-overlay {{
-                position: absolute;
-                top: 0; left: 0; right: 0; bottom: 0;
-                background-image:
-                    linear-gradient(0deg, rgba({accent_rgb}, {0.15 * dec}) 1px, transparent 1px),
-                    linear-gradient(90deg, rgba({accent_rgb}, {0.15 * dec}) 1px, transparent 1px);
-                background-size: 50px 50px;
-                z-index: 1;
-                pointer-events: none;
-            }}'''
-
-        return ""
-
-    def _build_og_html(self, width: int = 1200, height: int = 630) -> str:
+        _, _, styles_template = self._bg_effect_templates()
+        return styles_template.format_map(self._bg_effect_context())
+
+    def _bg_effect_templates(self) -> tuple[str, str, str]:
+        """Templates for the style's bg_effect; unknown effects fall back to aurora."""
+        return EFFECT_TEMPLATES.get(self.style.bg_effect, EFFECT_TEMPLATES['aurora'])
+
+    def _bg_effect_context(self) -> dict:
+        """Placeholder values for the EFFECT_TEMPLATES strings."""
+        colors = {
+            'bg': self.brand.background_color,
+            'primary': self.brand.primary_color,
+            'accent': self.brand.accent_color,
+        }
+        return {
+            **colors,
+            'accent_rgb': self._hex_to_rgb_str(self.brand.accent_color),
+            'primary_rgb': self._hex_to_rgb_str(self.brand.primary_color),
+            'angle': self.style.gradient_angle,
+            'dec': _Scaled(self.style.decoration),
+            'blend': _Blends(colors),
+        }
+
+    def _build_og_html(
+        self,
+        width: int = 1200,
+        height: int = 630,
+        responsive: bool = False,
+        inline_fonts: bool = False
+    ) -> str:
         """Build HTML for OG image."""
         # Convert colors to RGB for rgba() usage
         accent_rgb = self._hex_to_rgb_str(self.brand.accent_color)
@@ -409,8 +453,18 @@ class HTMLGenerator:
                 tagline_font_size = 24
             tagline_html = f'<p class="tagline">{tagline}</p>'
 
+        # Fixed pixels for rendering, viewport units for iframe previews
+        if responsive:
+            body_width, body_height = '100vw', '100vh'
+            brand_font_size = '7.3vw'  # 88/1200 ≈ 7.3%
+            tagline_font_size = TAGLINE_VW_SIZES[tagline_font_size]
+        else:
+            body_width, body_height = f'{width}px', f'{height}px'
+            brand_font_size = '88px'
+            tagline_font_size = f'{tagline_font_size}px'
+
         # URL-encode font name for Google Fonts
-        font_encoded = self.style.font.replace(' ', '+')
+        font_css = self._font_css(f'400;700;{self.style.font_weight}', inline_fonts)
 
         # Calculate decoration-scaled values
         dec = self.style.decoration
@@ -426,13 +480,13 @@ class HTMLGenerator:
 <html>
 <head>
     <style>
-        @import url('https://fonts.googleapis.com/css2?family={font_encoded}:wght@400;700;{self.style.font_weight}&display=swap');
+        {font_css}
 
         * {{ margin: 0; padding: 0; box-sizing: border-box; }}
 
         body {{
-            width: {width}px;
-            height: {height}px;
+            width: {body_width};
+            height: {body_height};
             font-family: 'Inter', -apple-system, BlinkMacSystemFont, sans-serif;
             position: relative;
             overflow: hidden;
@@ -459,7 +513,7 @@ class HTMLGenerator:
         /* Brand name with glow effect */
         .brand-name {{
             color: {self.brand.text_color};
-            font-size: 88px;
+            font-size: {brand_font_size};
             font-weight: {self.style.font_weight};
             font-family: '{self.style.font}', -apple-system, BlinkMacSystemFont, sans-serif;
             letter-spacing: -3px;
@@ -489,7 +543,7 @@ class HTMLGenerator:
         /* Tagline - full text with dynamic font size */
         .tagline {{
             color: {self._blend_colors(self.brand.text_color, self.brand.accent_color, 0.3)};
-            font-size: {tagline_font_size}px;
+            font-size: {tagline_font_size};
             font-weight: 400;
             line-height: 1.5;
             text-align: center;
@@ -563,16 +617,117 @@ class HTMLGenerator:
         Returns:
             PIL Image (RGB)
         """
-        html = self._build_og_html(width, height)
+        html = self._build_og_html(width, height, inline_fonts=True)
         return self._render_html(html, width, height, transparent=False)
 
+    def render_og_png(self, width: int = 1200, height: int = 630) -> bytes:
+        """Render the OG image to Chromium's PNG bytes, skipping PIL."""
+        html = self._build_og_html(width, height, inline_fonts=True)
+        return self._render_bytes(html, width, height)
+
+    def render_og_png_and_jpeg(
+        self,
+        width: int = 1200,
+        height: int = 630,
+        quality: int = OG_JPEG_QUALITY
+    ) -> Tuple[bytes, bytes]:
+        """Render the OG image once, screenshotting it as PNG and as JPEG.
+
+        The JPEG comes from Chromium's encoder, which is several times
+        faster than its PNG one, and skips the PIL round trip, so it suits
+        previews. The PNG is the lossless og-image.png; decoding the JPEG
+        instead would bake its artifacts into it.
+
+        Args:
+            width: Image width
+            height: Image height
+            quality: JPEG quality (1-100)
+
+        Returns:
+            (PNG bytes, JPEG bytes)
+        """
+        html = self._build_og_html(width, height, inline_fonts=True)
+        page = get_browser().new_page(
+            viewport={'width': width, 'height': height},
+            device_scale_factor=1,
+        )
+
+        try:
+            page.set_content(html)
+            png = self._screenshot(page)
+            jpeg = self._screenshot(page, image_format='jpeg', quality=quality)
+        finally:
+            page.close()
+
+        return png, jpeg
+
+    def generate_logo_and_og_image(
+        self,
+        logo_size: int = 512,
+        og_width: int = 1200,
+        og_height: int = 630,
+        og_bytes: bool = False
+    ) -> tuple[Image.Image, Union[Image.Image, bytes]]:
+        """Generate logo and OG image concurrently.
+
+        Both pages are rendered as one _screenshot_batch.
+
+        Args:
+            og_bytes: Return the OG image as Chromium's PNG bytes, for
+                callers that only save it
+
+        Returns:
+            (logo RGBA Image, OG RGB Image or PNG bytes)
+        """
+        logo_png, og_png = self._screenshot_batch([
+            (self._build_logo_html(logo_size, inline_fonts=True), logo_size, logo_size, True),
+            (self._build_og_html(og_width, og_height, inline_fonts=True), og_width, og_height, False),
+        ])
+
+        logo = self._decode(logo_png, transparent=True)
+        og_image = og_png if og_bytes else self._decode(og_png, transparent=False)
+        return logo, og_image
+
+    def _screenshot_batch(self, specs: List[Tuple[str, int, int, bool]]) -> List[bytes]:
+        """Screenshot (html, width, height, transparent) pages as PNG bytes.
+
+        All pages share one browser context, so web fonts are fetched
+        once. Every load is started before any is waited on, so Chromium
+        lays the pages out in parallel; sync Playwright can't be driven
+        from a second thread, and this gets the overlap without it.
+        """
+        context = get_browser().new_context(device_scale_factor=1)
+
+        try:
+            pages = []
+            for html, width, height, _ in specs:
+                page = context.new_page()
+                page.set_viewport_size({'width': width, 'height': height})
+                page.set_content(html, wait_until='commit')
+                pages.append(page)
+
+            return [
+                self._screenshot(page, transparent)
+                for page, (_, _, _, transparent) in zip(pages, specs)
+            ]
+        finally:
+            context.close()
+
+    def _font_css(self, weights: str, inline: bool) -> str:
+        """CSS that loads the brand font at weights (e.g. '400;700').
+
+        Inline means @font-face rules with embedded font files, so a render
+        needs no network; falls back to the Google Fonts @import.
+        """
+        if inline:
+            css = inline_google_font_css(self.style.font, weights)
+            if css is not None:
+                return css
+        return f"@import url('{google_fonts_url(self.style.font, weights)}');"
+
     def _hex_to_rgb_str(self, hex_color: str) -> str:
         """Convert hex color to 'r, g, b' string for CSS rgba()."""
-        hex_color = hex_color.lstrip('#')
-        if len(hex_color) == 3:
-            hex_color = ''.join(c * 2 for c in hex_color)
-        r, g, b = int(hex_color[0:2], 16), int(hex_color[2:4], 16), int(hex_color[4:6], 16)
-        return f"{r}, {g}, {b}"
+        return hex_to_rgb_str(hex_color)
 
     def _render_html(
         self,
@@ -592,30 +747,60 @@ class HTMLGenerator:
         Returns:
             PIL Image
         """
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-
-            page = browser.new_page(
-                viewport={'width': width, 'height': height},
-                device_scale_factor=1,
-            )
+        screenshot_bytes = self._render_bytes(html, width, height, transparent)
+        return self._decode(screenshot_bytes, transparent)
 
+    def _render_bytes(
+        self,
+        html: str,
+        width: int,
+        height: int,
+        transparent: bool = False,
+        image_format: str = 'png',
+        quality: Optional[int] = None
+    ) -> bytes:
+        """Render HTML to encoded image bytes ('png' or 'jpeg')."""
+        # Reuse this thread's browser; only the page is per-render
+        page = get_browser().new_page(
+            viewport={'width': width, 'height': height},
+            device_scale_factor=1,
+        )
+
+        try:
             page.set_content(html)
-            page.wait_for_load_state('networkidle')
-
-            screenshot_bytes = page.screenshot(
-                type='png',
-                omit_background=transparent,
-            )
-
-            browser.close()
+            return self._screenshot(page, transparent, image_format, quality)
+        finally:
+            page.close()
 
+    def _screenshot(
+        self,
+        page,
+        transparent: bool = False,
+        image_format: str = 'png',
+        quality: Optional[int] = None
+    ) -> bytes:
+        """Wait for a page's fonts/resources to settle, then screenshot it."""
+        # 'load' covers the stylesheet @import; web fonts are only requested
+        # at layout, so wait on document.fonts too. Much quicker than
+        # 'networkidle', which always idles 500ms after the last request.
+        page.wait_for_load_state('load')
+        page.evaluate('document.fonts.ready.then(() => undefined)')
+
+        if image_format == 'jpeg':
+            # JPEG has no alpha channel, so transparency doesn't apply
+            return page.screenshot(type='jpeg', quality=quality)
+        return page.screenshot(type='png', omit_background=transparent)
+
+    def _decode(self, screenshot_bytes: bytes, transparent: bool = False) -> Image.Image:
+        """Decode screenshot bytes to an RGBA (transparent) or RGB image."""
         img = Image.open(io.BytesIO(screenshot_bytes))
 
-        if transparent:
-            img = img.convert('RGBA')
+        # convert() copies even when the mode already matches
+        mode = 'RGBA' if transparent else 'RGB'
+        if img.mode != mode:
+            img = img.convert(mode)
         else:
-            img = img.convert('RGB')
+            img.load()
 
         return img
 
@@ -630,17 +815,4 @@ class HTMLGenerator:
         Returns:
             Blended color (hex)
         """
-        def hex_to_rgb(hex_color: str) -> tuple:
-            hex_color = hex_color.lstrip('#')
-            if len(hex_color) == 3:
-                hex_color = ''.join(c * 2 for c in hex_color)
-            return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
-
-        r1, g1, b1 = hex_to_rgb(color1)
-        r2, g2, b2 = hex_to_rgb(color2)
-
-        r = int(r1 * (1 - factor) + r2 * factor)
-        g = int(g1 * (1 - factor) + g2 * factor)
-        b = int(b1 * (1 - factor) + b2 * factor)
-
-        return f'#{r:02x}{g:02x}{b:02x}'
+        return blend_colors(color1, color2, factor)
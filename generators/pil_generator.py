@@ -1,14 +1,12 @@
 """PIL-based logo and OG image generator."""
-import math
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Tuple
 
 from PIL import Image, ImageDraw, ImageFont
 
-import sys
-sys.path.insert(0, str(__file__).rsplit('/', 2)[0])
 from models.brand_identity import BrandIdentity
-from utils.color_utils import hex_to_rgb
+from utils.color_utils import contrast_ratio, hex_to_rgb
 
 
 # Font paths on macOS
@@ -20,18 +18,52 @@ FONT_PATHS = [
 ]
 
 
+@lru_cache(maxsize=1)
+def _installed_font_paths() -> Tuple[str, ...]:
+    """FONT_PATHS that exist on this machine (checked once)."""
+    return tuple(font_path for font_path in FONT_PATHS if Path(font_path).exists())
+
+
+@lru_cache(maxsize=64)
 def get_font(size: int, bold: bool = True) -> ImageFont.FreeTypeFont:
-    """Get a font at specified size, with fallback."""
-    for font_path in FONT_PATHS:
-        if Path(font_path).exists():
-            try:
-                return ImageFont.truetype(font_path, size)
-            except (OSError, IOError):
-                continue
+    """Get a font at specified size, with fallback.
+
+    Cached, so each size is only parsed by FreeType once; treat the
+    returned font as read-only.
+    """
+    for font_path in _installed_font_paths():
+        try:
+            return ImageFont.truetype(font_path, size)
+        except (OSError, IOError):
+            continue
     # Fallback to default
     return ImageFont.load_default()
 
 
+@lru_cache(maxsize=256)
+def text_bbox(text: str, size: int, bold: bool = True) -> Tuple[int, int, int, int]:
+    """Get the bounding box of text drawn at (0, 0) in get_font(size, bold).
+
+    Cached, as brand names and initials are laid out over and over.
+    """
+    draw = ImageDraw.Draw(Image.new('RGBA', (1, 1)))
+    return draw.textbbox((0, 0), text, font=get_font(size, bold))
+
+
+@lru_cache(maxsize=64)
+def text_mask(text: str, size: int, bold: bool = True) -> Image.Image:
+    """Get text rasterized in get_font(size, bold) as an 'L' coverage mask.
+
+    The mask covers text_bbox(text, size, bold); paste a color through it
+    at (x + bbox[0], y + bbox[1]) to draw the text at (x, y). Cached, so
+    the same initials across logo styles and sizes are rasterized once.
+    """
+    left, top, right, bottom = text_bbox(text, size, bold)
+    mask = Image.new('L', (right - left, bottom - top), 0)
+    ImageDraw.Draw(mask).text((-left, -top), text, font=get_font(size, bold), fill=255)
+    return mask
+
+
 class PILGenerator:
     """Generate logos and OG images using PIL."""
 
@@ -79,10 +111,9 @@ class PILGenerator:
         # Draw initials
         initials = self.brand.initials
         font_size = int(size * 0.45)
-        font = get_font(font_size)
 
         # Center text
-        bbox = draw.textbbox((0, 0), initials, font=font)
+        bbox = text_bbox(initials, font_size)
         text_width = bbox[2] - bbox[0]
         text_height = bbox[3] - bbox[1]
 
@@ -91,45 +122,44 @@ class PILGenerator:
 
         # Use accent color for text if it contrasts well, otherwise use text_color
         text_color = self.accent_rgb if self._contrast_ok() else self.text_rgb
-        draw.text((x, y), initials, font=font, fill=text_color)
+        img.paste(text_color, (x + bbox[0], y + bbox[1]), text_mask(initials, font_size))
 
         return img
 
     def _generate_gradient_logo(self, size: int) -> Image.Image:
         """Gradient style: diagonal gradient with white text."""
-        img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-
-        # Create gradient
-        for y in range(size):
-            for x in range(size):
-                # Diagonal gradient factor
-                factor = (x + y) / (2 * size)
-                r = int(self.primary_rgb[0] * (1 - factor) + self.accent_rgb[0] * factor)
-                g = int(self.primary_rgb[1] * (1 - factor) + self.accent_rgb[1] * factor)
-                b = int(self.primary_rgb[2] * (1 - factor) + self.accent_rgb[2] * factor)
-                img.putpixel((x, y), (r, g, b, 255))
+        # Create gradient. The color only depends on x + y, so compute each
+        # of the 2 * size - 1 diagonals once; row y is diagonals y..y+size-1.
+        diagonals = bytearray()
+        for d in range(2 * size - 1):
+            # Diagonal gradient factor
+            factor = d / (2 * size)
+            r = int(self.primary_rgb[0] * (1 - factor) + self.accent_rgb[0] * factor)
+            g = int(self.primary_rgb[1] * (1 - factor) + self.accent_rgb[1] * factor)
+            b = int(self.primary_rgb[2] * (1 - factor) + self.accent_rgb[2] * factor)
+            diagonals += bytes((r, g, b, 255))
+
+        pixels = b''.join(diagonals[4 * y:4 * (y + size)] for y in range(size))
+        img = Image.frombytes('RGBA', (size, size), pixels)
 
         # Draw white initials
-        draw = ImageDraw.Draw(img)
         initials = self.brand.initials
         font_size = int(size * 0.45)
-        font = get_font(font_size)
 
-        bbox = draw.textbbox((0, 0), initials, font=font)
+        bbox = text_bbox(initials, font_size)
         text_width = bbox[2] - bbox[0]
         text_height = bbox[3] - bbox[1]
 
         x = (size - text_width) // 2
         y = (size - text_height) // 2 - bbox[1]
 
-        draw.text((x, y), initials, font=font, fill=(255, 255, 255, 255))
+        img.paste((255, 255, 255, 255), (x + bbox[0], y + bbox[1]), text_mask(initials, font_size))
 
         return img
 
     def _generate_geometric_logo(self, size: int) -> Image.Image:
         """Geometric style: overlapping circles."""
         img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
 
         center = size // 2
         radius = size // 3
@@ -152,7 +182,17 @@ class PILGenerator:
             y0 = center + oy - radius
             x1 = center + ox + radius
             y1 = center + oy + radius
-            draw.ellipse([x0, y0, x1, y1], fill=color)
+
+            # ImageDraw overwrites RGBA pixels instead of blending, so draw
+            # each circle on a layer covering just its (clipped) bounds and
+            # composite that for the translucent overlaps
+            left, top = max(x0, 0), max(y0, 0)
+            right, bottom = min(x1 + 1, size), min(y1 + 1, size)
+            layer = Image.new('RGBA', (right - left, bottom - top), (0, 0, 0, 0))
+            ImageDraw.Draw(layer).ellipse(
+                [x0 - left, y0 - top, x1 - left, y1 - top], fill=color
+            )
+            img.alpha_composite(layer, dest=(left, top))
 
         return img
 
@@ -161,18 +201,19 @@ class PILGenerator:
 
         Creates a gradient background with centered brand name.
         """
-        img = Image.new('RGB', (width, height), self.bg_rgb)
-
-        # Add subtle gradient overlay
+        # Subtle gradient overlay on the flat background. It only varies
+        # by row, so blend one color per row and repeat it across.
+        current = self.bg_rgb
+        rows = []
         for y in range(height):
             factor = y / height
-            for x in range(width):
-                current = img.getpixel((x, y))
-                # Blend towards accent at bottom
-                r = int(current[0] * (1 - factor * 0.3) + self.accent_rgb[0] * factor * 0.3)
-                g = int(current[1] * (1 - factor * 0.3) + self.accent_rgb[1] * factor * 0.3)
-                b = int(current[2] * (1 - factor * 0.3) + self.accent_rgb[2] * factor * 0.3)
-                img.putpixel((x, y), (r, g, b))
+            # Blend towards accent at bottom
+            r = int(current[0] * (1 - factor * 0.3) + self.accent_rgb[0] * factor * 0.3)
+            g = int(current[1] * (1 - factor * 0.3) + self.accent_rgb[1] * factor * 0.3)
+            b = int(current[2] * (1 - factor * 0.3) + self.accent_rgb[2] * factor * 0.3)
+            rows.append(bytes((r, g, b)) * width)
+
+        img = Image.frombytes('RGB', (width, height), b''.join(rows))
 
         draw = ImageDraw.Draw(img)
 
@@ -181,7 +222,7 @@ class PILGenerator:
         font = get_font(font_size)
 
         text = self.brand.name
-        bbox = draw.textbbox((0, 0), text, font=font)
+        bbox = text_bbox(text, font_size)
         text_width = bbox[2] - bbox[0]
         text_height = bbox[3] - bbox[1]
 
@@ -196,7 +237,7 @@ class PILGenerator:
             tagline_font = get_font(tagline_font_size)
             tagline = self.brand.tagline[:80]  # Truncate long taglines
 
-            t_bbox = draw.textbbox((0, 0), tagline, font=tagline_font)
+            t_bbox = text_bbox(tagline, tagline_font_size)
             t_width = t_bbox[2] - t_bbox[0]
 
             tx = (width - t_width) // 2
@@ -223,23 +264,10 @@ class PILGenerator:
         fill: Tuple[int, ...]
     ):
         """Draw a rounded rectangle."""
-        x0, y0, x1, y1 = bounds
-
-        # PIL 9.2+ has rounded_rectangle
-        try:
-            draw.rounded_rectangle(bounds, radius, fill=fill)
-        except AttributeError:
-            # Fallback for older PIL
-            draw.rectangle([x0 + radius, y0, x1 - radius, y1], fill=fill)
-            draw.rectangle([x0, y0 + radius, x1, y1 - radius], fill=fill)
-            draw.ellipse([x0, y0, x0 + 2*radius, y0 + 2*radius], fill=fill)
-            draw.ellipse([x1 - 2*radius, y0, x1, y0 + 2*radius], fill=fill)
-            draw.ellipse([x0, y1 - 2*radius, x0 + 2*radius, y1], fill=fill)
-            draw.ellipse([x1 - 2*radius, y1 - 2*radius, x1, y1], fill=fill)
+        # Pillow >= 10 is required, so rounded_rectangle (9.2+) is always there
+        draw.rounded_rectangle(bounds, radius, fill=fill)
 
     def _contrast_ok(self) -> bool:
         """Check if accent color has enough contrast with primary."""
-        # Simple luminance difference check
-        primary_lum = sum(self.primary_rgb) / 3
-        accent_lum = sum(self.accent_rgb) / 3
-        return abs(primary_lum - accent_lum) > 80
+        # Initials are large text, so WCAG's 3:1 applies
+        return contrast_ratio(self.brand.primary_color, self.brand.accent_color) >= 3.0
@@ -1,9 +1,41 @@
 """Brand identity dataclass for storing extracted brand information."""
-from dataclasses import dataclass, field
-from typing import List, Optional
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Literal, Optional, Tuple, get_args
 
 
-@dataclass
+# Words of a CamelCase name (FairPrice -> Fair, Price)
+CAMEL_WORD_PATTERN = re.compile(r'[A-Z][a-z]*')
+
+
+# Frozen + slotted rules out cached_property, so cache on the name instead
+@lru_cache(maxsize=256)
+def _initials(name: str) -> str:
+    """Initials for a brand name (see BrandIdentity.initials)."""
+    # Clean the name
+    clean_name = ''.join(c for c in name if c.isalnum() or c.isspace())
+
+    # First try: split by spaces
+    words = clean_name.split()
+    if len(words) >= 2:
+        return (words[0][0] + words[-1][0]).upper()
+
+    # Second try: split CamelCase (FairPrice -> Fair, Price)
+    camel_words = CAMEL_WORD_PATTERN.findall(clean_name)
+    if len(camel_words) >= 2:
+        return (camel_words[0][0] + camel_words[-1][0]).upper()
+
+    # Fallback: first two characters
+    if len(clean_name) >= 2:
+        return clean_name[:2].upper()
+
+    return clean_name.upper() or "??"
+
+
+# StyleConfig and BrandIdentity are frozen so instances are hashable and
+# can key generator caches, and slotted to skip the per-instance __dict__
+@dataclass(frozen=True, slots=True)
 class StyleConfig:
     """Style configuration for OG image generation."""
     glow: float = 1.0           # Text glow intensity (0=none, 2=strong)
@@ -33,6 +65,13 @@ BG_EFFECTS = {
     'geometric': 'Subtle geometric grid pattern',
 }
 
+# Type for validated effect names (keep in sync with BG_EFFECTS; checked below)
+BgEffect = Literal[
+    'aurora', 'mesh', 'noise', 'waves', 'spotlight',
+    'minimal', 'glass', 'dots', 'diagonal', 'geometric',
+]
+assert set(get_args(BgEffect)) == BG_EFFECTS.keys(), 'BgEffect and BG_EFFECTS disagree'
+
 
 # Preset moods
 MOOD_PRESETS = {
@@ -44,13 +83,13 @@ MOOD_PRESETS = {
 }
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class BrandIdentity:
     """Represents extracted brand identity from a website."""
 
     name: str                              # "FairPrice"
     domain: str                            # "fairprice.work"
-    colors: List[str] = field(default_factory=list)  # All extracted colors
+    colors: Tuple[str, ...] = ()           # All extracted colors
     primary_color: str = "#333333"         # Main brand color
     accent_color: str = "#666666"          # Secondary/highlight color
     background_color: str = "#ffffff"      # Background color
@@ -62,26 +101,7 @@ class BrandIdentity:
     @property
     def initials(self) -> str:
         """Get brand initials for text logo (e.g., 'FP' for 'FairPrice')."""
-        import re
-
-        # Clean the name
-        clean_name = ''.join(c for c in self.name if c.isalnum() or c.isspace())
-
-        # First try: split by spaces
-        words = clean_name.split()
-        if len(words) >= 2:
-            return (words[0][0] + words[-1][0]).upper()
-
-        # Second try: split CamelCase (FairPrice -> Fair, Price)
-        camel_words = re.findall(r'[A-Z][a-z]*', clean_name)
-        if len(camel_words) >= 2:
-            return (camel_words[0][0] + camel_words[-1][0]).upper()
-
-        # Fallback: first two characters
-        if len(clean_name) >= 2:
-            return clean_name[:2].upper()
-
-        return clean_name.upper() or "??"
+        return _initials(self.name)
 
     def __repr__(self) -> str:
         return (
@@ -31,7 +31,7 @@ done
 # Check output files exist
 echo ""
 echo "📋 Checking generated files..."
-EXPECTED_FILES="favicon.ico favicon-16x16.png favicon-32x32.png apple-touch-icon.png android-chrome-192x192.png android-chrome-512x512.png og-image.png site.webmanifest preview.html"
+EXPECTED_FILES="favicon.ico favicon-16x16.png favicon-32x32.png apple-touch-icon.png android-chrome-192x192.png android-chrome-512x512.png og-image.png site.webmanifest preview.html preview.js"
 
 for file in $EXPECTED_FILES; do
     if [ -f "$OUTPUT_DIR/aurora/$file" ]; then
@@ -1,8 +1,16 @@
 """Color utility functions for brand-kit-gen."""
+import math
 import re
+from functools import lru_cache
 from typing import Tuple, Optional
 
 
+# Matches rgb(r, g, b) or rgba(r, g, b, a)
+RGB_PATTERN = re.compile(r'rgba?\s*\(\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)')
+
+
+# Brand colors are parsed over and over while building CSS; cache the results
+@lru_cache(maxsize=1024)
 def hex_to_rgb(hex_color: str) -> Tuple[int, int, int]:
     """Convert hex color to RGB tuple.
 
@@ -18,17 +26,15 @@ def hex_to_rgb(hex_color: str) -> Tuple[int, int, int]:
     if len(hex_color) == 3:
         hex_color = ''.join(c * 2 for c in hex_color)
 
-    if len(hex_color) != 6:
+    # int() would also accept signs, spaces and underscores
+    if len(hex_color) != 6 or not (hex_color.isascii() and hex_color.isalnum()):
         return (0, 0, 0)
 
     try:
-        return (
-            int(hex_color[0:2], 16),
-            int(hex_color[2:4], 16),
-            int(hex_color[4:6], 16)
-        )
+        value = int(hex_color, 16)
     except ValueError:
         return (0, 0, 0)
+    return (value >> 16, (value >> 8) & 0xFF, value & 0xFF)
 
 
 def rgb_to_hex(r: int, g: int, b: int) -> str:
@@ -36,6 +42,46 @@ def rgb_to_hex(r: int, g: int, b: int) -> str:
     return f"#{r:02x}{g:02x}{b:02x}"
 
 
+@lru_cache(maxsize=256)
+def hex_to_rgb_str(hex_color: str) -> str:
+    """Convert hex color to an 'r, g, b' string for CSS rgba()."""
+    return '{}, {}, {}'.format(*hex_to_rgb(hex_color))
+
+
+# Same few brand/background blends recur across renders, like hex_to_rgb
+@lru_cache(maxsize=1024)
+def blend_colors(color1: str, color2: str, factor: float) -> str:
+    """Blend two hex colors.
+
+    Args:
+        color1: Base color (hex)
+        color2: Color to blend in (hex)
+        factor: Blend factor (0 = color1, 1 = color2)
+
+    Returns:
+        Blended color (hex)
+    """
+    r1, g1, b1 = hex_to_rgb(color1)
+    r2, g2, b2 = hex_to_rgb(color2)
+
+    return rgb_to_hex(
+        int(r1 * (1 - factor) + r2 * factor),
+        int(g1 * (1 - factor) + g2 * factor),
+        int(b1 * (1 - factor) + b2 * factor),
+    )
+
+
+def _gamma(c: float) -> float:
+    """sRGB gamma expansion of a 0-1 channel value."""
+    return c / 12.92 if c <= 0.03928 else ((c + 0.055) / 1.055) ** 2.4
+
+
+# Linear-light value of each 0-255 sRGB channel value, for luminance()
+LINEAR_CHANNEL = tuple(_gamma(c / 255.0) for c in range(256))
+
+
+# Color classification scores the same page colors repeatedly
+@lru_cache(maxsize=4096)
 def luminance(hex_color: str) -> float:
     """Calculate relative luminance of a color (0-1 scale).
 
@@ -44,21 +90,8 @@ def luminance(hex_color: str) -> float:
     """
     r, g, b = hex_to_rgb(hex_color)
 
-    # Normalize to 0-1
-    r_norm = r / 255.0
-    g_norm = g / 255.0
-    b_norm = b / 255.0
-
-    # Apply gamma correction
-    def gamma(c):
-        return c / 12.92 if c <= 0.03928 else ((c + 0.055) / 1.055) ** 2.4
-
-    r_lin = gamma(r_norm)
-    g_lin = gamma(g_norm)
-    b_lin = gamma(b_norm)
-
     # WCAG relative luminance
-    return 0.2126 * r_lin + 0.7152 * g_lin + 0.0722 * b_lin
+    return 0.2126 * LINEAR_CHANNEL[r] + 0.7152 * LINEAR_CHANNEL[g] + 0.0722 * LINEAR_CHANNEL[b]
 
 
 def contrast_ratio(color1: str, color2: str) -> float:
@@ -94,9 +127,7 @@ def parse_rgb_string(rgb_str: str) -> Optional[str]:
     Returns:
         Hex color string or None if invalid
     """
-    # Match rgb(r, g, b) or rgba(r, g, b, a)
-    pattern = r'rgba?\s*\(\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)'
-    match = re.search(pattern, rgb_str)
+    match = RGB_PATTERN.search(rgb_str)
 
     if match:
         r, g, b = int(match.group(1)), int(match.group(2)), int(match.group(3))
@@ -105,6 +136,8 @@ def parse_rgb_string(rgb_str: str) -> Optional[str]:
     return None
 
 
+# CSS repeats the same few color tokens; normalize each once
+@lru_cache(maxsize=4096)
 def normalize_color(color: str) -> Optional[str]:
     """Normalize any color format to lowercase hex.
 
@@ -126,18 +159,17 @@ def normalize_color(color: str) -> Optional[str]:
 
 def color_distance(color1: str, color2: str) -> float:
     """Calculate Euclidean distance between two colors in RGB space."""
-    r1, g1, b1 = hex_to_rgb(color1)
-    r2, g2, b2 = hex_to_rgb(color2)
-
-    return ((r1 - r2) ** 2 + (g1 - g2) ** 2 + (b1 - b2) ** 2) ** 0.5
+    return math.dist(hex_to_rgb(color1), hex_to_rgb(color2))
 
 
+@lru_cache(maxsize=4096)
 def is_grayscale(hex_color: str, tolerance: int = 10) -> bool:
     """Check if color is grayscale (R ≈ G ≈ B)."""
     r, g, b = hex_to_rgb(hex_color)
     return max(r, g, b) - min(r, g, b) <= tolerance
 
 
+@lru_cache(maxsize=4096)
 def saturation(hex_color: str) -> float:
     """Calculate color saturation (0-1 scale)."""
     r, g, b = hex_to_rgb(hex_color)
@@ -0,0 +1,108 @@
+"""Byte-budgeted on-disk cache shared by the web app and the font cache."""
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+
+class DiskCache:
+    """Byte-budgeted cache of files in a directory.
+
+    Survives restarts and is shared by every worker process pointed at
+    the same directory. Writes go to a temp file and are renamed into
+    place, so readers never see a partial entry; reads bump the mtime,
+    which eviction treats as the last use.
+
+    Blocking file I/O: call from worker threads, not the event loop.
+    """
+
+    # Temp files this old were left behind by a crashed writer
+    STALE_TMP_SECONDS = 3600
+
+    def __init__(self, directory: Path, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # Running estimate of the directory size; only _evict scans it
+        self._bytes = self._scan()[1]
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f'{key}.bin'
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Get item from disk, marking it recently used."""
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+        except OSError:
+            return None
+        return data
+
+    def set(self, key: str, value: bytes):
+        """Write item to disk, evicting least recently used entries if over budget."""
+        tmp = None
+        try:
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(value)
+            os.replace(tmp, self._path(key))
+        except OSError:
+            if tmp is not None:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+            return
+
+        with self._lock:
+            self._bytes += len(value)
+            over_budget = self._bytes > self.max_bytes
+        if over_budget:
+            self._evict()
+
+    def _scan(self) -> tuple[list, int]:
+        """List (mtime, size, path) of every entry and their total size.
+
+        Also deletes stale temp files from writers that died mid-write.
+        """
+        now = time.time()
+        for path in self.directory.glob('*.tmp'):
+            try:
+                if now - path.stat().st_mtime > self.STALE_TMP_SECONDS:
+                    path.unlink()
+            except OSError:
+                pass
+
+        entries = []
+        total = 0
+        for path in self.directory.glob('*.bin'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue  # Evicted by another worker
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        return entries, total
+
+    def _evict(self):
+        """Delete oldest entries until the directory is 90% of its budget.
+
+        Leaving headroom means the next few writes don't each rescan.
+        """
+        with self._lock:
+            entries, total = self._scan()
+            entries.sort()
+            target = self.max_bytes * 9 // 10
+            for _, size, path in entries:
+                if total <= target:
+                    break
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+                total -= size
+            self._bytes = total
@@ -0,0 +1,82 @@
+"""Shared HTTP session for all outgoing requests."""
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.compat import chardet
+from requests.utils import DEFAULT_ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+
+
+USER_AGENT = 'Mozilla/5.0 (compatible; BrandKitGen/1.0)'
+
+# Pages past this size are truncated; everything a brand kit needs is in
+# the first part of the document, and parsing the rest only costs time
+MAX_HTML_BYTES = 2 * 1024 * 1024
+
+
+def create_session() -> requests.Session:
+    """Create a pooled session that retries transient failures.
+
+    Only idempotent requests are retried, so a POST to a paid image API is
+    never sent twice. After the last retry the response is returned as-is
+    for the caller's raise_for_status(). Read timeouts are not retried:
+    the server already has the request, so a retry only multiplies the
+    wait (and, for an image API, the generations).
+    """
+    retry = Retry(
+        total=2,
+        read=False,
+        backoff_factor=0.3,
+        status_forcelist=(502, 503, 504),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry)
+
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update({
+        'User-Agent': USER_AGENT,
+        # Spelled out so compression survives header overrides; only lists
+        # codings urllib3 can actually decode here (br needs brotli)
+        'Accept-Encoding': DEFAULT_ACCEPT_ENCODING,
+        'Accept': 'text/html,text/css,*/*;q=0.5',
+    })
+    return session
+
+
+# One session per process, so connections (and TLS handshakes) to the
+# target site, its stylesheet hosts and the AI APIs are reused across calls
+SESSION = create_session()
+
+
+def fetch_text(
+    url: str,
+    timeout: float,
+    session: Optional[requests.Session] = None,
+    max_bytes: int = MAX_HTML_BYTES,
+) -> str:
+    """GET url and return the decoded body, reading at most max_bytes.
+
+    Decodes like response.text. Raises requests.RequestException on
+    network errors and HTTP error statuses.
+    """
+    session = session or SESSION
+    with session.get(url, timeout=timeout, stream=True) as response:
+        response.raise_for_status()
+        body = bytearray()
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            body += chunk
+            if len(body) >= max_bytes:
+                del body[max_bytes:]
+                break
+        encoding = response.encoding
+
+    body = bytes(body)
+    if encoding is None:
+        encoding = chardet.detect(body)['encoding'] if chardet else None
+    try:
+        return str(body, encoding or 'utf-8', errors='replace')
+    except LookupError:
+        return str(body, 'utf-8', errors='replace')  # Unknown charset